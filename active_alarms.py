@@ -0,0 +1,111 @@
+import math
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import site_data
+from filter_index import FilterIndex
+from offline_cube import OfflineCube
+from site_index import normalize_site_ids
+
+# "All Active Alarms": one table over every alarm log.
+# DSE, Rectifier, SPD, events and the Rectifier Fan export share one schema; they
+# are unioned once per data version into a category-encoded table; Alarm labels are
+# already canonical (category_aliases.json). Counts come from a count cube and
+# table pages from precomputed sort orders plus the bitmap filter index, so a
+# request only materializes one page.
+
+ALARM_COLUMNS = [
+    'Site Id', 'Alarm', 'Sub Region', 'Region', 'Beginning', 'Days Passed', 'Aging',
+    'ES POC', 'SMS POC', 'History | Issue', 'Summarize', 'Domain', 'Source',
+]
+ALARM_DIMENSIONS = ('Region', 'Sub Region', 'Aging', 'Domain', 'Alarm')
+SORT_COLUMNS = ['Days Passed', 'Beginning', 'Site Id', 'Alarm', 'Sub Region', 'Region']
+PAGE_SIZE = 50
+
+
+def alarm_table(frames):
+    """Union of the alarm logs, one row per (site, alarm type, beginning)
+
+    events.csv repeats the per-type logs; of each duplicate the row with the most
+    filled-in fields is kept. 'Source' names the log the row came from.
+    """
+    parts = []
+    for name in site_data.ALARM_DATASETS:
+        df = frames.get(name)
+        if df is None or df.empty:
+            continue
+        part = df.reindex(columns=ALARM_COLUMNS[:-1]).astype(object)
+        part['Site Id'] = normalize_site_ids(df['Site Id']).astype(object)
+        part['Beginning'] = df['Beginning']
+        part['Days Passed'] = df['Days Passed'].astype(float)
+        part['Source'] = name
+        parts.append(part)
+    if not parts:
+        return pd.DataFrame(columns=ALARM_COLUMNS)
+
+    table = pd.concat(parts, ignore_index=True).dropna(subset=['Site Id', 'Alarm', 'Beginning'])
+    filled = table.notna().sum(axis=1).to_numpy()
+    table = table.iloc[np.argsort(-filled, kind='stable')]
+    table = table.drop_duplicates(['Site Id', 'Alarm', 'Beginning']).sort_index().reset_index(drop=True)
+    for column in ALARM_COLUMNS:
+        if column not in ('Site Id', 'Beginning', 'Days Passed'):
+            table[column] = table[column].astype('category')
+    return table
+
+
+def _sort_orders(series):
+    """Stable (ascending, descending) row orders of a column, missing values last in both"""
+    if not (pd.api.types.is_numeric_dtype(series) or pd.api.types.is_datetime64_any_dtype(series)):
+        series = series.astype(object)
+    codes, uniques = pd.factorize(series, sort=True)
+    missing = codes < 0
+    ascending = np.argsort(np.where(missing, len(uniques), codes), kind='stable')
+    descending = np.argsort(np.where(missing, 1, -codes), kind='stable')
+    return ascending, descending
+
+
+class AlarmPage(NamedTuple):
+    rows: pd.DataFrame
+    total: int      # rows matching the filters
+    page: int
+    pages: int
+
+
+class ActiveAlarms:
+    """Unified alarm table with pre-aggregated counts and paginated slices"""
+
+    def __init__(self, frames):
+        self.table = alarm_table(frames)
+        self.cube = OfflineCube.from_frame(self.table, ALARM_DIMENSIONS)
+        self.filter_index = FilterIndex(self.table, ALARM_DIMENSIONS)
+        self._orders = {column: _sort_orders(self.table[column]) for column in SORT_COLUMNS}
+
+    @staticmethod
+    def _where(filters):
+        # Empty selections mean "no filter", like the dashboard dropdowns
+        return {column: values for column, values in (filters or {}).items() if values}
+
+    def count(self, filters=None):
+        """Number of alarms matching ``filters`` ({dimension: value or [values]})"""
+        return self.cube.total(self._where(filters))
+
+    def counts_by(self, dimension, filters=None, sort=True, top=None):
+        """Alarm counts along one dimension, as an ordered dict"""
+        return self.cube.counts_by(dimension, self._where(filters), sort=sort, top=top)
+
+    def page(self, filters=None, sort_by='Days Passed', descending=True, page=0, page_size=PAGE_SIZE):
+        """One page of the alarms matching ``filters``, sorted by ``sort_by``"""
+        selected = np.unpackbits(self.filter_index.bitset(self._where(filters)), count=len(self.table)).astype(bool)
+        order = self._orders[sort_by][1 if descending else 0]
+        matching = order[selected[order]]
+        pages = max(math.ceil(len(matching) / page_size), 1)
+        page = min(max(page, 0), pages - 1)
+        positions = matching[page * page_size:(page + 1) * page_size]
+        return AlarmPage(
+            rows=self.table.take(positions).reset_index(drop=True),
+            total=len(matching),
+            page=page,
+            pages=pages,
+        )
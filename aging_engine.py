@@ -0,0 +1,107 @@
+from datetime import date
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+import frame_schema
+import site_data
+from lru_cache import LRUCache
+
+# Current aging instead of the frozen "Days Passed" / "Aging" columns.
+# Offline Date (DB.csv) and Beginning (alarm logs) are turned into int64 day
+# numbers once per data version; days offline for any reference date is then one
+# subtraction and the aging bucket one searchsorted against the bucket edges.
+# Results are cached per (dataset, reference day).
+
+
+class AgingScheme(NamedTuple):
+    edges: tuple   # inclusive upper bound of every bucket but the last
+    labels: tuple
+
+
+# Buckets as labelled in the exports
+DB_AGING = AgingScheme(
+    edges=(5, 15, 30, 100),
+    labels=('1 - 05 Days', '6 - 15 Days', '16 - 30 Days', '31 - 100 Days', '100+ Days'),
+)
+ALARM_AGING = AgingScheme(
+    edges=(10, 30, 100, 180),
+    labels=('01 - 10 Days', '11 - 30 Days', '31 - 100 Days', '100+ Days', '180+ Days'),
+)
+
+DATE_SOURCES = {'db': ('Offline Date', DB_AGING)}
+DATE_SOURCES.update({name: ('Beginning', ALARM_AGING) for name in site_data.ALARM_DATASETS})
+
+
+def day_number(value=None):
+    """Days since 1970-01-01 of a date (today when None)"""
+    return int(np.datetime64(value or date.today(), 'D').astype(np.int64))
+
+
+def day_numbers(dates):
+    """int64 day numbers of a datetime Series plus a mask of the known ones"""
+    days = dates.to_numpy().astype('datetime64[D]')
+    known = ~np.isnat(days)
+    return days.astype(np.int64), known
+
+
+def bucket_codes(days, scheme):
+    """Index of each day count's bucket in ``scheme.labels``"""
+    return np.searchsorted(np.asarray(scheme.edges), days, side='left')
+
+
+class AgingEngine:
+    """Days offline and aging buckets of every dated dataset, for any reference date"""
+
+    def __init__(self, frames, cache_size=32):
+        self._sources = {}
+        for name, (column, scheme) in DATE_SOURCES.items():
+            df = frames.get(name)
+            if df is not None and column in df.columns:
+                days, known = day_numbers(df[column])
+                self._sources[name] = (days, known, scheme)
+        self._cache = LRUCache(cache_size)
+
+    def days_offline(self, name, as_of=None):
+        """Days since each row's start date as float, NaN where the date is unknown"""
+        today = day_number(as_of)
+        return self._cache.get_or_compute(('days', name, today), lambda: self._days_offline(name, today))
+
+    def _days_offline(self, name, today):
+        days, known, _ = self._sources[name]
+        result = np.where(known, today - days, np.nan)
+        result.setflags(write=False)
+        return result
+
+    def aging(self, name, as_of=None):
+        """Aging bucket of each row as a Categorical, NaN where the date is unknown"""
+        today = day_number(as_of)
+        return self._cache.get_or_compute(('aging', name, today), lambda: self._aging(name, today))
+
+    def _aging(self, name, today):
+        days, known, scheme = self._sources[name]
+        codes = bucket_codes(np.maximum(today - days, 0), scheme)
+        codes[~known] = -1
+        return pd.Categorical.from_codes(codes, categories=list(scheme.labels))
+
+    def refresh(self, frames, as_of=None):
+        """Copies of ``frames`` with Days Passed / Aging / Aging Category as of ``as_of``
+
+        Rows without a start date keep their exported values; frames without a
+        date column are returned unchanged.
+        """
+        refreshed = dict(frames)
+        for name in self._sources:
+            df = frames[name]
+            _, known, _ = self._sources[name]
+            days = np.where(known, self.days_offline(name, as_of), df['Days Passed'].to_numpy(dtype=float))
+            aging = pd.Series(self.aging(name, as_of), index=df.index).astype(object)
+            if 'Aging' in df.columns:
+                aging = aging.where(known, df['Aging'].astype(object))
+            refreshed[name] = df.assign(**{
+                'Days Passed': frame_schema.compact_integers(days),
+                'Aging': aging.astype('category'),
+                'Aging Category': aging.astype(object).fillna('Unknown').astype('category'),
+            })
+        return refreshed
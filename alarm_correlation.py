@@ -0,0 +1,97 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+# Which sites have different alarm types open at the same time, and for how long.
+# Every alarm log row is an interval from its Beginning to the export date
+# (Beginning + Days Passed, inclusive); the logs are unioned and de-duplicated by
+# active_alarms first. All intervals are swept once in
+# (site, day) order: a running per-type count gives the open alarm types on each
+# segment between events, so the whole fleet is O(n log n) for the sort plus O(n * types).
+
+
+class AlarmCorrelation(NamedTuple):
+    """Co-occurrence of open alarm types"""
+    sites: pd.DataFrame   # one row per site with two or more types open at once
+    pairs: pd.DataFrame   # one row per pair of alarm types that overlapped somewhere
+
+
+def alarm_intervals(alarms):
+    """(Site Id, Alarm Type, Start, End) intervals of an active_alarms.alarm_table
+
+    Start/End are day numbers (days since 1970-01-01), End exclusive.
+    """
+    start = alarms['Beginning'].to_numpy().astype('datetime64[D]').astype(np.int64)
+    days = np.clip(alarms['Days Passed'].fillna(0).to_numpy(), 0, None).astype(np.int64)
+    return pd.DataFrame({
+        'Site Id': alarms['Site Id'].to_numpy(),
+        'Alarm Type': alarms['Alarm'].astype(object).to_numpy(),
+        'Start': start,
+        'End': start + days + 1,
+    })
+
+
+def correlate(intervals):
+    """Sweep the intervals and report overlapping alarm types per site and per pair"""
+    site_codes, sites = pd.factorize(intervals['Site Id'])
+    type_codes, types = pd.factorize(intervals['Alarm Type'], sort=True)
+    n_types = len(types)
+
+    # Every interval becomes an opening and a closing event
+    site = np.concatenate([site_codes, site_codes])
+    time = np.concatenate([intervals['Start'].to_numpy(), intervals['End'].to_numpy()])
+    kind = np.concatenate([type_codes, type_codes])
+    delta = np.concatenate([np.ones(len(intervals), np.int64), -np.ones(len(intervals), np.int64)])
+    order = np.lexsort((delta, time, site))
+    site, time, kind, delta = site[order], time[order], kind[order], delta[order]
+
+    # Open intervals per type after each event; each site's events sum to zero,
+    # so one running sum over all sites resets itself at site boundaries
+    steps = np.zeros((len(site), n_types), dtype=np.int64)
+    steps[np.arange(len(site)), kind] = delta
+    open_types = np.cumsum(steps, axis=0) > 0
+
+    # Segment from each event to the next one of the same site
+    same_site = np.append(site[1:] == site[:-1], False)
+    length = np.where(same_site, np.append(time[1:], 0) - time, 0)
+    concurrent = open_types.sum(axis=1)
+
+    pair_days = (open_types * length[:, None]).T @ open_types
+
+    # Segments with two or more types open, reduced per site (they are already in site order)
+    multi = np.flatnonzero((concurrent >= 2) & (length > 0))
+    starts = np.flatnonzero(np.diff(site[multi], prepend=-1)) if len(multi) else multi
+    if len(multi):
+        seen = np.logical_or.reduceat(open_types[multi], starts, axis=0)
+        # A pair counts for a site only if both types were open on the same segment,
+        # not merely somewhere in the site's history
+        co_open = open_types[multi][:, :, None] & open_types[multi][:, None, :]
+        site_pairs = np.logical_or.reduceat(co_open, starts, axis=0)
+        max_concurrent = np.maximum.reduceat(concurrent[multi], starts)
+        overlap_days = np.add.reduceat(length[multi], starts)
+        first_overlap = np.minimum.reduceat(time[multi], starts)
+    else:
+        seen = np.zeros((0, n_types), dtype=bool)
+        site_pairs = np.zeros((0, n_types, n_types), dtype=bool)
+        max_concurrent = overlap_days = first_overlap = np.zeros(0, dtype=np.int64)
+    pair_sites = site_pairs.sum(axis=0)
+
+    site_table = pd.DataFrame({
+        'Site Id': np.asarray(sites)[site[multi][starts]] if len(multi) else [],
+        'Alarm Types': [', '.join(types[row]) for row in seen],
+        'Max Concurrent': max_concurrent,
+        'Overlap Days': overlap_days,
+        'First Overlap': first_overlap.astype('datetime64[D]'),
+    })
+    site_table = site_table.sort_values(['Max Concurrent', 'Overlap Days'], ascending=False, kind='stable').reset_index(drop=True)
+
+    pair_rows = [
+        {'Alarm A': types[a], 'Alarm B': types[b], 'Sites': int(pair_sites[a, b]), 'Overlap Days': int(pair_days[a, b])}
+        for a in range(n_types)
+        for b in range(a + 1, n_types)
+        if pair_days[a, b]
+    ]
+    pair_table = pd.DataFrame(pair_rows, columns=['Alarm A', 'Alarm B', 'Sites', 'Overlap Days'])
+    pair_table = pair_table.sort_values('Overlap Days', ascending=False, kind='stable').reset_index(drop=True)
+    return AlarmCorrelation(sites=site_table, pairs=pair_table)
@@ -0,0 +1,78 @@
+import streamlit as st
+import plotly.graph_objects as go
+
+from active_alarms import PAGE_SIZE, SORT_COLUMNS
+from data_snapshot import get_worker
+
+# Page configuration, applied by whichever script is the Streamlit entry point
+PAGE_CONFIG = dict(
+    page_title="All Active Alarms Database",
+    layout="wide"
+)
+
+FILTER_DIMENSIONS = ['Alarm', 'Region', 'Sub Region', 'Aging', 'Domain']
+
+# Shared with the other pages: one worker per process builds the alarm table off the request path
+@st.cache_resource
+def snapshot_worker():
+    return get_worker()
+
+def create_bar_chart(counts, title, x_label):
+    """Bar chart of a {label: count} dict"""
+    fig = go.Figure(data=[go.Bar(
+        x=list(counts.keys()),
+        y=list(counts.values()),
+        text=list(counts.values()),
+        textposition='auto'
+    )])
+    fig.update_layout(title=title, xaxis_title=x_label, yaxis_title="Count", height=350)
+    return fig
+
+def render():
+    st.title("🔔 All Active Alarms Database")
+    if st.button("⬅ Back to Home", key="alarms_back"):
+        st.session_state.page = 'main'
+        st.rerun()
+
+    alarms = snapshot_worker().current().alarms
+
+    # Filters are read from the pre-aggregated labels, never from the rows
+    filter_columns = st.columns(len(FILTER_DIMENSIONS))
+    filters = {}
+    for column, dimension in zip(filter_columns, FILTER_DIMENSIONS):
+        with column:
+            options = list(alarms.counts_by(dimension, sort=False))
+            filters[dimension] = st.multiselect(dimension, options, key=f"alarms_{dimension}")
+
+    # KPI cards
+    by_alarm = alarms.counts_by('Alarm', filters)
+    kpi_columns = st.columns(len(by_alarm) + 1)
+    kpi_columns[0].metric("Active Alarms", alarms.count(filters))
+    for column, (alarm, count) in zip(kpi_columns[1:], by_alarm.items()):
+        column.metric(alarm, count)
+
+    # Charts
+    chart1, chart2 = st.columns(2)
+    with chart1:
+        st.plotly_chart(create_bar_chart(by_alarm, "Active Alarms by Type", "Alarm"), use_container_width=True)
+    with chart2:
+        st.plotly_chart(create_bar_chart(alarms.counts_by('Sub Region', filters), "Active Alarms by Sub Region", "Sub Region"), use_container_width=True)
+
+    # Paginated table
+    sort_column, order_column, page_column = st.columns(3)
+    with sort_column:
+        sort_by = st.selectbox("Sort by", SORT_COLUMNS, key="alarms_sort")
+    with order_column:
+        descending = st.radio("Order", ["Descending", "Ascending"], horizontal=True, key="alarms_order") == "Descending"
+    total = alarms.count(filters)
+    pages = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    with page_column:
+        page = st.number_input("Page", min_value=1, max_value=pages, value=1, key="alarms_page") - 1
+
+    result = alarms.page(filters, sort_by=sort_by, descending=descending, page=page)
+    st.caption(f"Page {result.page + 1} of {result.pages} · {result.total} alarms")
+    st.dataframe(result.rows, use_container_width=True, hide_index=True)
+
+if __name__ == "__main__":
+    st.set_page_config(**PAGE_CONFIG)
+    render()
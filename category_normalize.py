@@ -0,0 +1,97 @@
+import json
+import os
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Canonical labels for the free-text categorical columns.
+# Exports spell the same thing differently (stray NBSPs, "A|B" vs "A | B", case,
+# "Dera Allah Yar" vs "DAY"). Labels are cleaned, matched case-insensitively,
+# mapped through category_aliases.json and merged into one category each. Only the
+# categories are touched, never the rows, so this runs after every load.
+
+ALIAS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'category_aliases.json')
+
+NORMALIZED_COLUMNS = ['Reason', 'Summarised', 'Summarize', 'History', 'History | Issue', 'Sub Region', 'Alarm']
+
+# Aliases under this key apply to every normalized column
+ALL_COLUMNS = '*'
+
+
+def clean_label(value):
+    """Unicode-normalized label with single spaces and ' | ' separators"""
+    text = unicodedata.normalize('NFKC', str(value))
+    text = re.sub(r'\s*\|\s*', ' | ', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def _key(value):
+    return clean_label(value).casefold()
+
+
+def load_aliases(path=ALIAS_FILE):
+    """{column: {match key: canonical label}} from a JSON alias file (empty if missing)"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return {}
+    return {
+        column: {_key(alias): clean_label(label) for alias, label in mapping.items()}
+        for column, mapping in raw.items()
+    }
+
+
+ALIASES = load_aliases()
+
+
+def canonical_labels(labels, counts, column, aliases=None):
+    """Canonical label for each of ``labels``; case variants take the most common spelling"""
+    aliases = ALIASES if aliases is None else aliases
+    lookup = dict(aliases.get(ALL_COLUMNS, {}))
+    lookup.update(aliases.get(column, {}))
+
+    cleaned = [lookup.get(_key(label), clean_label(label)) for label in labels]
+    spelling = {}
+    for label, count in sorted(zip(cleaned, counts), key=lambda pair: -pair[1]):
+        spelling.setdefault(label.casefold(), label)
+    return [spelling[label.casefold()] for label in cleaned]
+
+
+def normalize_categories(series, column, aliases=None):
+    """A text/categorical column re-encoded onto its canonical categories"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    labels = list(series.cat.categories)
+    codes = series.cat.codes.to_numpy()
+    if not labels:
+        return series
+    counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+    canonical = canonical_labels(labels, counts, column, aliases)
+    categories = sorted(set(canonical))
+    if categories == labels:
+        return series
+    position = {label: i for i, label in enumerate(categories)}
+    remap = np.array([position[label] for label in canonical] + [-1])
+    return pd.Series(pd.Categorical.from_codes(remap[codes], categories=categories), index=series.index, name=series.name)
+
+
+def normalize_frame(df, aliases=None):
+    """Normalize every NORMALIZED_COLUMNS column that holds text; other columns are shared"""
+    columns = {}
+    for column in NORMALIZED_COLUMNS:
+        if column not in df.columns:
+            continue
+        # One lookup: df[column] may return a new Series object on every access
+        series = df[column]
+        if isinstance(series.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(series):
+            normalized = normalize_categories(series, column, aliases)
+            if normalized is not series:
+                columns[column] = normalized
+    if not columns:
+        return df
+    result = df.assign(**columns)
+    result.attrs.update(df.attrs)
+    return result
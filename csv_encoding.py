@@ -0,0 +1,61 @@
+import codecs
+import io
+import re
+
+import pandas as pd
+
+# Bytes inspected when deciding between UTF-8 and cp1252
+SAMPLE_SIZE = 64 * 1024
+
+# Undecodable bytes come back from surrogateescape as lone surrogates
+_ESCAPED_BYTE = re.compile('[\udc80-\udcff]')
+
+
+def detect_encoding(sample):
+    """Pick utf-8 or cp1252 from a bounded sample of raw bytes"""
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    try:
+        # final=False so a multi-byte character cut at the sample edge is not an error
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        # The exports come from Excel on Windows, so non-UTF-8 means cp1252
+        return 'cp1252'
+
+
+def _repair_byte(match):
+    byte = bytes([ord(match.group()) - 0xDC00])
+    try:
+        return byte.decode('cp1252')
+    except UnicodeDecodeError:
+        return byte.decode('latin1')
+
+
+def decode_bytes(raw, sample_size=SAMPLE_SIZE):
+    """Decode raw CSV bytes in one pass, returning (text, encoding, repaired_bytes)
+
+    Stray bytes that do not fit the detected encoding (e.g. a cp1252 NBSP in an
+    otherwise UTF-8 file) are repaired through cp1252 instead of failing the load.
+    """
+    encoding = detect_encoding(raw[:sample_size])
+    text, repaired = decode_as(raw, encoding)
+    return text, encoding, repaired
+
+
+def decode_as(raw, encoding):
+    """Decode raw bytes with a known encoding, returning (text, repaired_bytes)"""
+    text = raw.decode(encoding, errors='surrogateescape')
+    return _ESCAPED_BYTE.subn(_repair_byte, text)
+
+
+def read_csv_bytes(raw, **kwargs):
+    """Parse CSV from raw bytes already in memory, decoded in a single pass
+
+    The chosen encoding and repaired byte count are stored in ``df.attrs``.
+    """
+    text, encoding, repaired = decode_bytes(raw)
+    df = pd.read_csv(io.StringIO(text), **kwargs)
+    df.attrs['encoding'] = encoding
+    df.attrs['repaired_bytes'] = repaired
+    return df
@@ -1,30 +1,36 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, dcc, html, Input, Output, callback
+from dash import Dash, dcc, html, Input, Output, State, callback, ctx
+from dash.exceptions import PreventUpdate
 import dash_bootstrap_components as dbc
 import numpy as np
 
-# Load the data with proper encoding
-try:
-    df = pd.read_csv('DB.csv', encoding='utf-8', on_bad_lines='skip')
-except UnicodeDecodeError:
-    try:
-        df = pd.read_csv('DB.csv', encoding='latin1', on_bad_lines='skip')
-    except UnicodeDecodeError:
-        df = pd.read_csv('DB.csv', encoding='cp1252', on_bad_lines='skip')
+from data_snapshot import get_worker
+from figure_cache import FigureCache
+from scatter_bins import scatter_figure, clicked_bin
 
-# Data preprocessing
-df.columns = df.columns.str.strip()  # Remove any leading/trailing spaces from column names
+# The snapshot worker loads and aggregates the data off the request path and
+# swaps in a new immutable snapshot whenever a CSV changes; callbacks only read it
+worker = get_worker()
 
-# Convert 'Offline Date' to datetime
-df['Offline Date'] = pd.to_datetime(df['Offline Date'], errors='coerce')
+# Callback outputs are memoized per (data version, normalized selection)
+figure_cache = FigureCache()
 
-# Fill NaN values in 'Days Passed' with 0
-df['Days Passed'] = pd.to_numeric(df['Days Passed'], errors='coerce').fillna(0)
+def on_snapshot(snapshot):
+    figure_cache.clear()
+    # Pre-render the unfiltered view so the first click after a reload is a cache hit
+    key = (snapshot.version, snapshot.filter_index.normalize({}), None)
+    figure_cache.get_or_compute(key, lambda: build_dashboard(snapshot.filter_index, {}))
 
-# Create Aging categories for better visualization
-df['Aging Category'] = df['Aging'].fillna('Unknown')
+worker.subscribe(on_snapshot)
+
+def dropdown_options(snapshot, column):
+    """Dropdown options for the values present in the snapshot's DB frame"""
+    return [{'label': value, 'value': value} for value in snapshot.frames['db'][column].dropna().unique()]
+
+# How often open dashboards ask whether the data version changed
+DATA_REFRESH_MS = 30 * 1000
 
 # Initialize the Dash app with Bootstrap theme
 app = Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
@@ -38,27 +44,31 @@ app.layout = dbc.Container([
     dbc.Row([
         dbc.Col([
             html.H5("Filters"),
+            # Filters start empty, i.e. unfiltered, so values added by a reload are never filtered out
             html.Label("Select Sub Region:"),
             dcc.Dropdown(
                 id='region-dropdown',
-                options=[{'label': region, 'value': region} for region in df['Sub Region'].dropna().unique()],
-                value=df['Sub Region'].dropna().unique().tolist(),
+                options=dropdown_options(worker.current(), 'Sub Region'),
+                value=[],
+                placeholder="All sub regions",
                 multi=True
             ),
             html.Br(),
             html.Label("Select Device Brand:"),
             dcc.Dropdown(
                 id='brand-dropdown',
-                options=[{'label': brand, 'value': brand} for brand in df['Device Brand'].dropna().unique()],
-                value=df['Device Brand'].dropna().unique().tolist(),
+                options=dropdown_options(worker.current(), 'Device Brand'),
+                value=[],
+                placeholder="All brands",
                 multi=True
             ),
             html.Br(),
             html.Label("Select Aging Category:"),
             dcc.Dropdown(
                 id='aging-dropdown',
-                options=[{'label': aging, 'value': aging} for aging in df['Aging Category'].dropna().unique()],
-                value=df['Aging Category'].dropna().unique().tolist(),
+                options=dropdown_options(worker.current(), 'Aging Category'),
+                value=[],
+                placeholder="All aging categories",
                 multi=True
             )
         ], width=3),
@@ -124,103 +134,65 @@ app.layout = dbc.Container([
                 ], width=12)
             ])
         ], width=9)
-    ])
+    ]),
+    
+    # Clients poll the data version cheaply and only redraw when it changes
+    dcc.Interval(id='data-refresh', interval=DATA_REFRESH_MS, n_intervals=0),
+    dcc.Store(id='data-version', data=worker.current().version)
 ], fluid=True)
 
-# Callbacks for interactivity
 @callback(
-    [Output('total-devices', 'children'),
-     Output('avg-days', 'children'),
-     Output('common-issue', 'children'),
-     Output('critical-count', 'children'),
-     Output('3d-scatter-plot', 'figure'),
-     Output('device-brand-pie', 'figure'),
-     Output('aging-category-histogram', 'figure'),
-     Output('reason-bar-chart', 'figure')],
-    [Input('region-dropdown', 'value'),
-     Input('brand-dropdown', 'value'),
-     Input('aging-dropdown', 'value')]
+    Output('data-version', 'data'),
+    Input('data-refresh', 'n_intervals'),
+    State('data-version', 'data')
 )
-def update_dashboard(selected_regions, selected_brands, selected_aging):
-    # Filter the dataframe based on selections
-    filtered_df = df.copy()
-    
-    # Convert to list if single value
-    if selected_regions:
-        if isinstance(selected_regions, str):
-            selected_regions = [selected_regions]
-        # Filter by regions
-        region_mask = df['Sub Region'].isin(selected_regions)
-        filtered_df = filtered_df[region_mask]
-    
-    if selected_brands:
-        if isinstance(selected_brands, str):
-            selected_brands = [selected_brands]
-        # Filter by brands
-        brand_mask = df['Device Brand'].isin(selected_brands)
-        filtered_df = filtered_df[brand_mask]
-    
-    if selected_aging:
-        if isinstance(selected_aging, str):
-            selected_aging = [selected_aging]
-        # Filter by aging
-        aging_mask = df['Aging Category'].isin(selected_aging)
-        filtered_df = filtered_df[aging_mask]
+def poll_data_version(n, known_version):
+    version = worker.current().version
+    if version == known_version:
+        raise PreventUpdate
+    return version
+
+@callback(
+    [Output('region-dropdown', 'options'),
+     Output('brand-dropdown', 'options'),
+     Output('aging-dropdown', 'options')],
+    Input('data-version', 'data')
+)
+def update_filter_options(data_version):
+    # A reload or the midnight roll-over can add regions, brands or aging categories
+    snapshot = worker.current()
+    return [dropdown_options(snapshot, column) for column in ['Sub Region', 'Device Brand', 'Aging Category']]
+
+def build_dashboard(filter_index, selections, drill_bin=None):
+    """Compute the KPI texts and figures for one filter selection"""
+    # Resolve the selection to row positions through the bitmap index
+    positions = filter_index.positions(selections)
     
     # Calculate KPIs
-    total_devices = len(filtered_df)
+    total_devices = len(positions)
     
     # Calculate average days offline
-    if len(filtered_df) > 0:
-        avg_days_offline = round(filtered_df['Days Passed'].mean(), 1)
+    if len(positions) > 0:
+        avg_days_offline = round(filter_index.df['Days Passed'].to_numpy()[positions].mean(), 1)
     else:
         avg_days_offline = 0
     
-    critical_count = len(filtered_df[filtered_df['Aging Category'] == '100+ Days'])
+    aging_counts = filter_index.value_counts('Aging Category', positions)
+    critical_count = int(aging_counts.get('100+ Days', 0))
     
     # Most common issue
-    if len(filtered_df) > 0:
-        reason_series = filtered_df['Reason'].fillna('Unknown')
-        mode_result = reason_series.mode()
-        if len(mode_result) > 0:
-            common_issue = mode_result.iloc[0]
-        else:
-            common_issue = "N/A"
+    reason_counts = filter_index.value_counts('Reason', positions, fill='Unknown')
+    if len(reason_counts) > 0:
+        common_issue = reason_counts.index[0]
     else:
         common_issue = "N/A"
     
-    # 3D Scatter Plot
-    if len(filtered_df) > 0:
-        # Create a 3D scatter plot with Days Passed, Device Brand, and Reason
-        fig_3d = px.scatter_3d(
-            filtered_df,
-            x='Days Passed',
-            y='Device Brand',
-            z='Sub Region',
-            color='Aging Category',
-            size='Days Passed',
-            hover_data=['Site Id', 'Reason'],
-            title="3D View of Offline Devices by Days, Brand, and Region"
-        )
-        
-        fig_3d.update_layout(
-            scene=dict(
-                xaxis_title='Days Passed',
-                yaxis_title='Device Brand',
-                zaxis_title='Sub Region'
-            ),
-            height=600
-        )
-    else:
-        fig_3d = go.Figure()
-        fig_3d.update_layout(
-            title="No Data Available",
-            height=600
-        )
+    # 3D Scatter Plot: raw points for small selections, count-sized bins above the threshold
+    fig_3d = scatter_figure(filter_index, positions, drill_bin)
     
     # Device Brand Pie Chart
-    if len(filtered_df) > 0:
-        brand_counts = filtered_df['Device Brand'].value_counts().reset_index()
+    if len(positions) > 0:
+        brand_counts = filter_index.value_counts('Device Brand', positions).reset_index()
         brand_counts.columns = ['Device Brand', 'Count']
         
         fig_pie = px.pie(
@@ -235,8 +207,8 @@ def update_dashboard(selected_regions, selected_brands, selected_aging):
         fig_pie.update_layout(title="No Data Available")
     
     # Aging Category Histogram
-    if len(filtered_df) > 0:
-        aging_counts = filtered_df['Aging Category'].value_counts().reset_index()
+    if len(positions) > 0:
+        aging_counts = aging_counts.reset_index()
         aging_counts.columns = ['Aging Category', 'Count']
         
         fig_hist = px.bar(
@@ -257,8 +229,8 @@ def update_dashboard(selected_regions, selected_brands, selected_aging):
         fig_hist.update_layout(title="No Data Available")
     
     # Reason Bar Chart
-    if len(filtered_df) > 0:
-        reason_counts = filtered_df['Reason'].fillna('Unknown').value_counts().head(10).reset_index()
+    if len(positions) > 0:
+        reason_counts = reason_counts.head(10).reset_index()
         reason_counts.columns = ['Reason', 'Count']
         
         fig_bar = px.bar(
@@ -290,6 +262,38 @@ def update_dashboard(selected_regions, selected_brands, selected_aging):
         fig_bar
     )
 
+# Callbacks for interactivity
+@callback(
+    [Output('total-devices', 'children'),
+     Output('avg-days', 'children'),
+     Output('common-issue', 'children'),
+     Output('critical-count', 'children'),
+     Output('3d-scatter-plot', 'figure'),
+     Output('device-brand-pie', 'figure'),
+     Output('aging-category-histogram', 'figure'),
+     Output('reason-bar-chart', 'figure')],
+    [Input('region-dropdown', 'value'),
+     Input('brand-dropdown', 'value'),
+     Input('aging-dropdown', 'value'),
+     Input('3d-scatter-plot', 'clickData'),
+     Input('data-version', 'data')]
+)
+def update_dashboard(selected_regions, selected_brands, selected_aging, click_data, data_version):
+    selections = {
+        'Sub Region': selected_regions,
+        'Device Brand': selected_brands,
+        'Aging Category': selected_aging,
+    }
+    # Clicking a bin marker drills into its raw points; any other trigger shows the full view
+    drill_bin = clicked_bin(click_data) if ctx.triggered_id == '3d-scatter-plot' else None
+    # Equivalent selections share one cache entry per data version
+    snapshot = worker.current()
+    key = (snapshot.version, snapshot.filter_index.normalize(selections), drill_bin)
+    return figure_cache.get_or_compute(key, lambda: build_dashboard(snapshot.filter_index, selections, drill_bin))
+
+# Warm the unfiltered view at startup, before the first request
+on_snapshot(worker.current())
+
 # Run the app
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=8050)
\ No newline at end of file
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import logging
+import os
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    # Without pyarrow the persistent cache is disabled and every process parses the CSVs
+    pa = None
+
+# Cleaned frames are kept as Arrow IPC (Feather v2) files in a folder next to the sources.
+# Each file records the source path, size, mtime and content hash it was built from.
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = '.rms_cache'
+CACHE_FORMAT = 2
+_META_KEY = b'rms_cache'
+
+
+def enabled():
+    """True when pyarrow is installed and the on-disk cache can be used"""
+    return pa is not None
+
+
+def cache_path(source, part=None):
+    """Cache file location for a source CSV (or one named table within it)"""
+    folder = os.path.join(os.path.dirname(os.path.abspath(source)), CACHE_DIR_NAME)
+    suffix = f'.{part}.arrow' if part else '.arrow'
+    return os.path.join(folder, os.path.basename(source) + suffix)
+
+
+def content_hash(source):
+    """BLAKE2 digest of a file's bytes"""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(source, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _read_meta(table):
+    raw = (table.schema.metadata or {}).get(_META_KEY)
+    return json.loads(raw) if raw else None
+
+
+def _read(source, part=None):
+    if pa is None:
+        return None, None
+    path = cache_path(source, part)
+    if not os.path.exists(path):
+        return None, None
+    try:
+        with pa.memory_map(path, 'r') as mapped:
+            table = pa.ipc.open_file(mapped).read_all()
+    except (OSError, pa.ArrowInvalid):
+        return None, None
+
+    meta = _read_meta(table)
+    if meta is None or meta.get('format') != CACHE_FORMAT:
+        return None, None
+    if meta.get('path') != os.path.abspath(source):
+        return None, None
+    return table, meta
+
+
+def load_any(source, part=None):
+    """Return the last cached frame for ``source`` whatever its version, or None"""
+    table, meta = _read(source, part)
+    if table is None:
+        return None
+    return _to_frame(table, meta)
+
+
+def load(source, version, part=None):
+    """Return the cached frame for ``source`` at ``version`` (size, mtime_ns), or None
+
+    A cache whose size/mtime no longer match is still used when the content
+    hash is unchanged (e.g. files re-copied during a deploy). ``part`` selects one
+    of several tables cached from the same source.
+    """
+    table, meta = _read(source, part)
+    if table is None:
+        return None
+    if [meta.get('size'), meta.get('mtime_ns')] != list(version):
+        if meta.get('size') != version[0] or meta.get('hash') != content_hash(source):
+            return None
+        # Same bytes under a new mtime: refresh the key so the next check is stat-only
+        df = _to_frame(table, meta)
+        store(source, version, df, meta['hash'], part)
+        return df
+    return _to_frame(table, meta)
+
+
+def _to_frame(table, meta):
+    df = table.to_pandas()
+    df.attrs.update(meta.get('attrs', {}))
+    return df
+
+
+def store(source, version, df, digest=None, part=None):
+    """Write a cleaned frame to the cache, replacing any previous version atomically"""
+    if pa is None:
+        return False
+    path = cache_path(source, part)
+    meta = {
+        'format': CACHE_FORMAT,
+        'path': os.path.abspath(source),
+        'size': version[0],
+        'mtime_ns': version[1],
+        'hash': digest or content_hash(source),
+        'attrs': dict(df.attrs),
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_META_KEY] = json.dumps(meta).encode('utf-8')
+        table = table.replace_schema_metadata(metadata)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, pa.ArrowException) as e:
+        log.warning("Could not write cache for %s: %s", source, e)
+        return False
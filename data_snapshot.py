@@ -0,0 +1,202 @@
+import logging
+import threading
+from datetime import date, datetime, timedelta
+from typing import NamedTuple
+
+import history_store
+import shared_snapshot
+import site_data
+from active_alarms import ActiveAlarms
+from aging_engine import AgingEngine
+from alarm_correlation import alarm_intervals, correlate
+from data_watcher import get_watcher
+from filter_index import FilterIndex
+from geo_index import GeoIndex
+from kpi_engine import TOP_REASONS, summarize_cube, summarize_spares
+from offline_cube import OfflineCube
+from site_index import SiteIndex
+
+# Precomputed, read-only view of all dashboard data.
+# The SnapshotWorker owns the data lifecycle: it rebuilds frames, the count cube,
+# KPI summary, chart series and filter index on the watcher thread whenever a CSV
+# changes, then publishes the new Snapshot with a single reference swap.
+# Request handlers only ever call current() and read from it.
+# Days Passed / Aging are recomputed from the start dates as of the build date, and
+# every snapshot is rebuilt at midnight so aging stays current without new data.
+
+log = logging.getLogger(__name__)
+
+FILTER_COLUMNS = ['Sub Region', 'Device Brand', 'Aging Category']
+# Site coordinate datasets indexed for map queries
+GEO_DATASETS = ['locations', 'tenants']
+
+
+class Snapshot(NamedTuple):
+    """Everything a page render needs, built off the request path"""
+    token: int
+    versions: dict       # dataset name -> file version it was built from
+    frames: dict         # dataset name -> cleaned frame (read-only)
+    cube: OfflineCube
+    summary: tuple       # kpi_engine.OfflineSummary
+    charts: dict         # chart name -> {label: count}
+    filter_index: FilterIndex
+    spares: tuple        # kpi_engine.SpareSummary
+    geo: dict            # dataset name -> GeoIndex
+    sites: SiteIndex     # per-site join across every frame
+    alarms: ActiveAlarms  # unified alarm table, counts and pages
+    correlation: tuple   # alarm_correlation.AlarmCorrelation
+    aging: AgingEngine   # days offline / aging buckets for any reference date
+    as_of: date          # reference date of Days Passed / Aging in ``frames``
+    built_at: datetime
+
+    @property
+    def version(self):
+        """Data token plus reference date: changes on every reload and at midnight
+
+        The same in every process serving the same shared data, so clients and
+        caches can key on it.
+        """
+        return f"{self.token}@{self.as_of.isoformat()}"
+
+
+def chart_series(cube):
+    """Chart-ready {label: count} series for the RMS database page"""
+    return {
+        'cluster_enfra': cube.counts_by('Cluster', {'Domain': 'Enfra'}),
+        'cluster_smsld': cube.counts_by('Cluster', {'Domain': 'SMS LD'}),
+        'aging_enfra': cube.counts_by('Aging', {'Domain': 'Enfra'}),
+        'aging_smsld': cube.counts_by('Aging', {'Domain': 'SMS LD'}),
+        'reasons': cube.counts_by('Reason', sort=True, top=TOP_REASONS),
+    }
+
+
+def build_snapshot(token, frames, versions, previous=None, changed=None, as_of=None):
+    """Build a Snapshot, reusing the DB aggregates of ``previous`` when DB.csv did not change"""
+    as_of = as_of or date.today()
+    if previous is not None and previous.as_of != as_of:
+        # A new day changes every aging-derived aggregate
+        changed = None
+    aging = AgingEngine(frames)
+    frames = aging.refresh(frames, as_of)
+    if previous is not None and changed is not None and 'db' not in changed:
+        cube, summary, charts, filter_index = previous.cube, previous.summary, previous.charts, previous.filter_index
+    else:
+        db = frames['db']
+        cube = OfflineCube.from_frame(db)
+        summary = summarize_cube(cube)
+        charts = chart_series(cube)
+        filter_index = FilterIndex(db, FILTER_COLUMNS)
+    geo = {
+        name: previous.geo[name] if previous is not None and changed is not None and name not in changed
+        else GeoIndex(frames[name])
+        for name in GEO_DATASETS
+    }
+    if previous is not None and changed is not None and not set(changed) & set(site_data.ALARM_DATASETS):
+        alarms, correlation = previous.alarms, previous.correlation
+    else:
+        alarms = ActiveAlarms(frames)
+        correlation = correlate(alarm_intervals(alarms.table))
+    return Snapshot(
+        token=token,
+        versions=versions,
+        frames=frames,
+        cube=cube,
+        summary=summary,
+        charts=charts,
+        filter_index=filter_index,
+        spares=summarize_spares(frames['spare_usage'], frames['spare_balance']),
+        geo=geo,
+        sites=SiteIndex(frames),
+        alarms=alarms,
+        correlation=correlation,
+        aging=aging,
+        as_of=as_of,
+        built_at=datetime.now(),
+    )
+
+
+class SnapshotWorker:
+    """Keeps an up-to-date Snapshot, rebuilt in the background on every data change"""
+
+    def __init__(self, watcher=None):
+        # Any source with token, frames() and subscribe(), e.g. a DataWatcher
+        self.watcher = watcher or get_watcher()
+        self._snapshot = None
+        self._ready = threading.Event()
+        self._listeners = []
+        self._build_lock = threading.Lock()
+
+    def start(self):
+        self._publish(self._build(self.watcher.token))
+        self.watcher.subscribe(self._on_change)
+        threading.Thread(target=self._roll_over, name='rms-snapshot-midnight', daemon=True).start()
+        return self
+
+    def current(self):
+        """Latest published snapshot (never None once started)"""
+        self._ready.wait()
+        return self._snapshot
+
+    def subscribe(self, callback):
+        """Call ``callback(snapshot)`` after each new snapshot is published"""
+        self._listeners.append(callback)
+
+    def _on_change(self, changed, token):
+        # The watcher and the midnight roll-over may both rebuild; publish in order
+        with self._build_lock:
+            try:
+                snapshot = self._build(token, changed)
+            except Exception:
+                # Keep serving the last good snapshot
+                log.exception("Snapshot rebuild failed")
+                return
+            self._publish(snapshot)
+
+    def _roll_over(self):
+        while True:
+            now = datetime.now()
+            midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+            threading.Event().wait((midnight - now).total_seconds() + 1)
+            # Same data token, new as_of: Snapshot.version still changes for clients and caches
+            self._on_change(None, self._snapshot.token)
+
+    def _build(self, token, changed=None):
+        frames, versions = self.watcher.frames()
+        return build_snapshot(token, frames, versions, self._snapshot, changed)
+
+    def _publish(self, snapshot):
+        # A single attribute assignment, so readers see the old or the new snapshot, never a mix
+        self._snapshot = snapshot
+        self._ready.set()
+        for callback in list(self._listeners):
+            try:
+                callback(snapshot)
+            except Exception:
+                log.exception("Snapshot listener failed")
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_worker():
+    """Process-wide snapshot worker, started on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            # Under several WSGI workers the parsed tables are shared instead of rebuilt per process
+            watcher = None
+            if shared_snapshot.enabled():
+                try:
+                    watcher = shared_snapshot.SharedDataWatcher().start()
+                except TimeoutError as e:
+                    # Fall back to parsing in this process, which reports the failing file itself
+                    log.warning("Shared snapshot unavailable, loading locally: %s", e)
+            worker = SnapshotWorker(watcher)
+            # Every published snapshot also extends the day-by-day history
+            worker.subscribe(history_store.get_store().record)
+            # Only keep a worker whose first build succeeded, so a failed start is retried
+            # by the next call instead of leaving current() waiting forever
+            worker.start()
+            _shared = worker
+        return _shared
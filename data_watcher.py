@@ -0,0 +1,143 @@
+import logging
+import os
+import threading
+
+import site_data
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    # Without watchdog (inotify/FSEvents/ReadDirectoryChanges) the watcher only polls
+    Observer = None
+
+# Background watcher for the RMS CSV exports.
+# When a file changes it is reloaded through site_data off the request path, a
+# data-version token is bumped and subscribers are told which datasets changed.
+# Dashboards key their caches on the token and pick it up on their next refresh.
+
+log = logging.getLogger(__name__)
+
+POLL_INTERVAL = float(os.environ.get('RMS_WATCH_INTERVAL', 2.0))
+
+
+class DataWatcher:
+    """Watches site_data's CSV files and reloads them when they change"""
+
+    def __init__(self, names=None, interval=POLL_INTERVAL):
+        self.names = list(names or site_data.DATA_FILES)
+        self.interval = interval
+        self.token = 0
+        self._versions = {}
+        self._failed = {}     # dataset name -> file version whose reload failed (logged once)
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+        self._observer = None
+
+    def version(self, name):
+        """File version of a dataset as of its last reload"""
+        with self._lock:
+            return self._versions.get(name)
+
+    def frames(self):
+        """Current cleaned frames and the file versions they were loaded from"""
+        frames = {name: site_data.load_dataset(name) for name in self.names}
+        with self._lock:
+            versions = {name: self._versions.get(name) for name in self.names}
+        return frames, versions
+
+    def subscribe(self, callback):
+        """Call ``callback(changed_names, token)`` on the watcher thread after each reload"""
+        self._listeners.append(callback)
+
+    def check(self):
+        """Reload every dataset whose file changed; returns the changed names"""
+        changed = []
+        for name in self.names:
+            try:
+                version = site_data.dataset_version(name)
+            except OSError:
+                # File missing or mid-replace: keep serving the last good frame
+                continue
+            if version == self.version(name):
+                continue
+            try:
+                site_data.load_dataset(name)
+            except Exception as e:
+                self._report_failure(name, version, e)
+                continue
+            self._failed.pop(name, None)
+            with self._lock:
+                self._versions[name] = version
+            changed.append(name)
+
+        if changed:
+            with self._lock:
+                self.token += 1
+                token = self.token
+            for callback in list(self._listeners):
+                try:
+                    callback(changed, token)
+                except Exception:
+                    log.exception("Data change listener failed")
+        return changed
+
+    def _report_failure(self, name, version, error):
+        # Polling retries every few seconds; report each failing file version once
+        if name not in self._failed or self._failed[name] != version:
+            self._failed[name] = version
+            log.warning("Reload of %s failed: %s", site_data.DATA_FILES[name], error)
+
+    def start(self):
+        """Load everything once, then keep watching on a daemon thread"""
+        if self._thread is not None:
+            return self
+        self.check()
+        if Observer is not None:
+            self._observer = Observer()
+            self._observer.schedule(_WakeHandler(self._wake), site_data.DATA_DIR, recursive=False)
+            self._observer.daemon = True
+            self._observer.start()
+        self._thread = threading.Thread(target=self._run, name='rms-data-watcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._observer is not None:
+            self._observer.stop()
+
+    def _run(self):
+        while not self._stop.is_set():
+            # Filesystem events wake the loop early; polling covers platforms without them
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            if not self._stop.is_set():
+                self.check()
+
+
+if Observer is not None:
+    class _WakeHandler(FileSystemEventHandler):
+        def __init__(self, wake):
+            self.wake = wake
+
+        def on_any_event(self, event):
+            if event.src_path.lower().endswith(('.csv', '.prn')):
+                self.wake.set()
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_watcher():
+    """Process-wide watcher, started on first use"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DataWatcher().start()
+        return _shared
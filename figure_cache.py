@@ -0,0 +1,14 @@
+from lru_cache import LRUCache
+
+# Bounded LRU cache for Dash callback outputs (KPI strings + Plotly figures).
+# Keys are the data version plus a canonical form of the filter selection, so
+# re-selecting the same regions/brands/aging in any order is served from memory.
+
+DEFAULT_MAXSIZE = 128
+
+
+class FigureCache(LRUCache):
+    """Thread-safe LRU of computed callback outputs with hit/miss counters"""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        super().__init__(maxsize)
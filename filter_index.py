@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Bitmap filter index for the Dash dropdown callbacks.
+# Built once at load time: one packed bitset per dropdown value. A selection is
+# answered by OR-ing bitsets within a column and AND-ing across columns, giving
+# matching row positions without copying or re-scanning the frame.
+
+
+class FilterIndex:
+    """Packed per-value bitsets over the categorical columns of a frame"""
+
+    def __init__(self, df, columns):
+        self.df = df
+        self.size = len(df)
+        self.columns = list(columns)
+        self._bitsets = {}
+        # Columns with NaN rows, which no value selection matches
+        self._has_missing = {}
+        for column in self.columns:
+            series = df[column]
+            if not isinstance(series.dtype, pd.CategoricalDtype):
+                series = series.astype('category')
+            codes = series.cat.codes.to_numpy()
+            self._bitsets[column] = {
+                label: np.packbits(codes == code)
+                for code, label in enumerate(series.cat.categories)
+            }
+            self._has_missing[column] = bool((codes < 0).any())
+        self._all = np.packbits(np.ones(self.size, dtype=bool))
+
+    def values(self, column):
+        """Dropdown values available for a column"""
+        return list(self._bitsets[column])
+
+    def bitset(self, selections):
+        """Packed bitset of rows matching ``selections`` ({column: value or [values]})
+
+        Like the original chained ``isin`` filters, an empty selection leaves the
+        column unfiltered and unknown values match nothing.
+        """
+        result = self._all
+        for column, selected in selections.items():
+            if not selected:
+                continue
+            if isinstance(selected, str):
+                selected = [selected]
+            bitsets = self._bitsets[column]
+            matched = [bitsets[value] for value in selected if value in bitsets]
+            column_bits = np.bitwise_or.reduce(matched) if matched else np.zeros_like(self._all)
+            result = result & column_bits
+        return result
+
+    def normalize(self, selections):
+        """Canonical, hashable form of a selection, e.g. for cache keys
+
+        Value order and unknown values are ignored. Selecting every value of a
+        column is the same as leaving it unfiltered unless the column has NaN rows,
+        which only the unfiltered view keeps.
+        """
+        key = []
+        for column in self.columns:
+            selected = selections.get(column)
+            if isinstance(selected, str):
+                selected = [selected]
+            if not selected:
+                selected = None
+            else:
+                values = frozenset(v for v in selected if v in self._bitsets[column])
+                # An empty tuple (only unknown values) matches nothing, None matches everything
+                everything = len(values) == len(self._bitsets[column]) and not self._has_missing[column]
+                selected = None if everything else tuple(sorted(values))
+            key.append((column, selected))
+        return tuple(key)
+
+    def positions(self, selections):
+        """Row positions matching ``selections``, in frame order"""
+        bits = np.unpackbits(self.bitset(selections), count=self.size)
+        return np.flatnonzero(bits)
+
+    def value_counts(self, column, positions, fill=None):
+        """Counts of a categorical column over the given rows, most common first
+
+        NaN rows are counted under ``fill`` when given, otherwise dropped.
+        """
+        series = self.df[column]
+        codes = series.cat.codes.to_numpy()[positions].astype(np.int64)
+        labels = [str(label) for label in series.cat.categories]
+        counts = np.bincount(codes + 1, minlength=len(labels) + 1)
+        pairs = {}
+        if fill is not None and counts[0]:
+            pairs[fill] = int(counts[0])
+        for label, count in zip(labels, counts[1:]):
+            if count:
+                pairs[label] = pairs.get(label, 0) + int(count)
+        result = pd.Series(pairs, dtype='int64', name='count')
+        result.index.name = column
+        return result.sort_values(ascending=False, kind='stable')
+
+    def rows(self, positions, columns=None):
+        """Materialize only the requested columns for the given rows"""
+        frame = self.df if columns is None else self.df[columns]
+        return frame.take(positions)
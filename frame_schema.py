@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+# Compact column types for the cleaned tables.
+# Text dimensions are already categories (site_data.CATEGORY_COLUMNS). On top of
+# that, site IDs are interned as categories (each distinct ID stored once, rows
+# hold int16 codes), and day counts and spare counts take the smallest integer
+# type that holds them, so months of alarm history fit in one process.
+
+ID_COLUMNS = ['Site Id', 'ENF Site ID', 'Site ID']
+INTEGER_COLUMNS = ['Days Passed', 'Used Count', 'Spare Received', 'Spare Used', 'Available Balance']
+
+# Never narrower than int16, so appending a tail rarely changes the column type
+INTEGER_TYPES = (np.int16, np.int32, np.int64)
+
+
+def compact_integers(values):
+    """Whole numbers as the smallest of INTEGER_TYPES; anything else as float32"""
+    array = np.asarray(values)
+    if array.dtype.kind == 'f':
+        if np.isnan(array).any() or not np.array_equal(array, np.trunc(array)):
+            compact = array.astype(np.float32)
+        else:
+            compact = _smallest_integers(array)
+    elif array.dtype.kind in 'iu':
+        compact = _smallest_integers(array)
+    else:
+        return values
+    if isinstance(values, pd.Series):
+        return pd.Series(compact, index=values.index, name=values.name)
+    return compact
+
+
+def _smallest_integers(array):
+    low, high = (array.min(), array.max()) if len(array) else (0, 0)
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return array.astype(dtype)
+    return array
+
+
+def compact_frame(df):
+    """``df`` with interned ID columns and narrowed integer columns, in place"""
+    for column in ID_COLUMNS:
+        if column in df.columns and pd.api.types.is_string_dtype(df[column]):
+            df[column] = df[column].astype('category')
+    for column in INTEGER_COLUMNS:
+        if column in df.columns and pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = compact_integers(df[column])
+    return df
+
+
+def memory_report(frames):
+    """Rows, bytes and the largest column of every table, largest table first"""
+    rows = []
+    for name, df in frames.items():
+        usage = df.memory_usage(deep=True, index=False)
+        total = int(usage.sum())
+        rows.append({
+            'Table': name,
+            'Rows': len(df),
+            'Columns': len(df.columns),
+            'Bytes': total,
+            'Bytes/Row': round(total / len(df), 1) if len(df) else 0.0,
+            'Largest Column': usage.idxmax() if len(usage) else None,
+            # Plain text columns still store one Python string per row
+            'Text Columns': sum(
+                pd.api.types.is_string_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype)
+                for dtype in df.dtypes
+            ),
+        })
+    return pd.DataFrame(rows).sort_values('Bytes', ascending=False, kind='stable').reset_index(drop=True)
+
+
+if __name__ == '__main__':
+    import site_data
+    print(memory_report(site_data.load_all()).to_string(index=False))
@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+
+# Spatial index over site coordinates for the Mapping and Tenants pages.
+# Locations.csv and tenant.csv keep "lat   lon" in one Latitude column; it is
+# parsed once into float arrays. Sites are bucketed into a uniform lat/lon grid
+# stored as sorted cell ids, so a query only touches the cells it overlaps and
+# then filters those candidates exactly.
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+# ~5.5 km cells: a few sites per cell at the density of the current exports
+CELL_DEGREES = 0.05
+
+_COORDINATE_PAIR = r'(-?\d+(?:\.\d+)?)\D+?(-?\d+(?:\.\d+)?)'
+
+
+def parse_coordinates(series):
+    """(lat, lon) float arrays from "lat lon" strings; unparseable rows are NaN
+
+    Degree signs and any separator between the two numbers are ignored.
+    """
+    pairs = series.astype('string').str.extract(_COORDINATE_PAIR)
+    lat = pd.to_numeric(pairs[0], errors='coerce').to_numpy(dtype=float)
+    lon = pd.to_numeric(pairs[1], errors='coerce').to_numpy(dtype=float)
+    outside = (np.abs(lat) > 90) | (np.abs(lon) > 180)
+    lat[outside] = np.nan
+    lon[outside] = np.nan
+    return lat, lon
+
+
+def haversine_km(lat, lon, lats, lons):
+    """Great-circle distance in km from one point to arrays of points"""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lats, lons = np.radians(lats), np.radians(lons)
+    a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class GeoIndex:
+    """Uniform-grid index over the coordinates of a site frame"""
+
+    def __init__(self, df, coordinate_column='Latitude', id_column='ENF Site ID', cell_degrees=CELL_DEGREES):
+        self.df = df
+        self.id_column = id_column
+        self.cell_degrees = cell_degrees
+        self.lat, self.lon = parse_coordinates(df[coordinate_column])
+        self.valid = ~(np.isnan(self.lat) | np.isnan(self.lon))
+
+        located = np.flatnonzero(self.valid)
+        if len(located):
+            self._lat0 = self.lat[located].min()
+            self._lon0 = self.lon[located].min()
+            rows, cols = self._cell(self.lat[located], self.lon[located])
+            self._n_cols = int(cols.max()) + 1
+            cells = rows * self._n_cols + cols
+        else:
+            self._lat0 = self._lon0 = 0.0
+            self._n_cols = 1
+            cells = np.empty(0, dtype=np.int64)
+        order = np.argsort(cells, kind='stable')
+        self._cells = cells[order]
+        self._positions = located[order]
+        self._n_rows = int(self._cells[-1] // self._n_cols) + 1 if len(self._cells) else 0
+
+    def _cell(self, lat, lon):
+        rows = np.floor((lat - self._lat0) / self.cell_degrees).astype(np.int64)
+        cols = np.floor((lon - self._lon0) / self.cell_degrees).astype(np.int64)
+        return rows, cols
+
+    def _candidates(self, south, west, north, east):
+        if not len(self._cells):
+            return self._positions
+        (row0, row1), (col0, col1) = self._cell(np.array([south, north]), np.array([west, east]))
+        row0, row1 = max(row0, 0), min(row1, self._n_rows - 1)
+        col0, col1 = max(col0, 0), min(col1, self._n_cols - 1)
+        if row0 > row1 or col0 > col1:
+            return self._positions[:0]
+        # Each grid row of the box is one contiguous run of sorted cell ids
+        starts = np.arange(row0, row1 + 1) * self._n_cols
+        lo = np.searchsorted(self._cells, starts + col0, side='left')
+        hi = np.searchsorted(self._cells, starts + col1, side='right')
+        return np.concatenate([self._positions[a:b] for a, b in zip(lo, hi)])
+
+    def site_mask(self, site_ids):
+        """Boolean row mask of the sites whose id is in ``site_ids``"""
+        return self.df[self.id_column].isin(pd.Index(site_ids).dropna()).to_numpy()
+
+    def within_bbox(self, south, west, north, east, mask=None):
+        """Row positions inside a lat/lon box (e.g. a map viewport), in frame order"""
+        candidates = self._candidates(south, west, north, east)
+        lat, lon = self.lat[candidates], self.lon[candidates]
+        inside = (lat >= south) & (lat <= north) & (lon >= west) & (lon <= east)
+        if mask is not None:
+            inside &= mask[candidates]
+        return np.sort(candidates[inside])
+
+    def within_radius(self, lat, lon, km, mask=None):
+        """(positions, distances in km) of sites within ``km`` of a point, nearest first"""
+        d_lat = km / KM_PER_DEGREE
+        d_lon = km / (KM_PER_DEGREE * max(np.cos(np.radians(lat)), 1e-6))
+        candidates = self._candidates(lat - d_lat, lon - d_lon, lat + d_lat, lon + d_lon)
+        if mask is not None:
+            candidates = candidates[mask[candidates]]
+        distances = haversine_km(lat, lon, self.lat[candidates], self.lon[candidates])
+        near = distances <= km
+        order = np.argsort(distances[near], kind='stable')
+        return candidates[near][order], distances[near][order]
+
+    def rows(self, positions, columns=None):
+        """Materialize the given rows with parsed Lat/Lon columns"""
+        frame = self.df if columns is None else self.df[columns]
+        frame = frame.take(positions).copy()
+        frame['Lat'] = self.lat[positions]
+        frame['Lon'] = self.lon[positions]
+        return frame
@@ -0,0 +1,339 @@
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    # Without pyarrow the history lives in memory for the life of the process
+    pa = None
+
+try:
+    import fcntl
+except ImportError:
+    # No flock (Windows): ingests are only serialized within the process
+    fcntl = None
+
+import site_data
+from aging_engine import day_number
+from lru_cache import LRUCache
+from offline_cube import UNKNOWN
+from site_index import normalize_site_ids
+
+# Day-by-day history of the offline sites and active alarms.
+# Every export overwrites the last one, so each published snapshot is diffed
+# against the recorded state and only the per-site deltas (opened, closed,
+# changed) are appended, one Arrow file per day in .rms_history. "State as of D"
+# keeps the last delta of each key up to D; "count per day" turns the deltas into
+# +1/-1 steps and takes a cumulative sum, so neither replays full copies.
+# Every worker process records its snapshots; ingests are serialized with a file
+# lock and a day file is never replaced by one built from older source files.
+
+log = logging.getLogger(__name__)
+
+HISTORY_DIR_NAME = '.rms_history'
+HISTORY_FORMAT = 2
+LOCK_NAME = 'ingest.lock'
+_META_KEY = b'rms_history'
+
+OPENED, CLOSED, CHANGED = 0, 1, 2
+
+# Recorded tables and the columns whose changes are recorded
+TRACKED_COLUMNS = {
+    'db': ['Cluster', 'Domain', 'Sub Region', 'Device Brand', 'Reason'],
+    'alarms': ['Alarm', 'Region', 'Sub Region', 'Domain'],
+}
+VALUE_COLUMNS = list(dict.fromkeys(column for columns in TRACKED_COLUMNS.values() for column in columns))
+LOG_COLUMNS = ['Day', 'Table', 'Key', 'Event'] + VALUE_COLUMNS
+TEXT_COLUMNS = ['Table', 'Key'] + VALUE_COLUMNS
+
+# One schema for every day file, so a year of days concatenates without conversion
+LOG_SCHEMA = pa.schema(
+    [pa.field('Day', pa.int32()), pa.field('Event', pa.int8())]
+    + [pa.field(column, pa.dictionary(pa.int32(), pa.string())) for column in TEXT_COLUMNS]
+) if pa is not None else None
+
+
+def current_states(db, alarms):
+    """{table: tracked columns indexed by key} of today's offline sites and active alarms
+
+    Sites without a Reason are online and left out. Sites are keyed by normalized
+    Site Id, alarms by site, alarm type and beginning.
+    """
+    db = db[db['Reason'].notna().to_numpy()]
+    sites = db.reindex(columns=TRACKED_COLUMNS['db']).astype(object)
+    sites.index = normalize_site_ids(db['Site Id']).astype(object)
+    beginning = alarms['Beginning'].dt.strftime('%Y-%m-%d %H:%M').astype(object)
+    keys = alarms['Site Id'].astype(object) + '|' + alarms['Alarm'].astype(object) + '|' + beginning
+    active = alarms.reindex(columns=TRACKED_COLUMNS['alarms']).astype(object)
+    active.index = keys
+    return {
+        name: state[state.index.notna() & ~state.index.duplicated()]
+        for name, state in (('db', sites), ('alarms', active))
+    }
+
+
+def diff_states(base, current):
+    """Delta rows (Key, Event, tracked columns) turning ``base`` into ``current``"""
+    base = base.reindex(columns=current.columns)
+    opened = current.loc[current.index.difference(base.index)]
+    closed = base.loc[base.index.difference(current.index)]
+    both = current.index.intersection(base.index)
+    new, old = current.loc[both], base.loc[both]
+    differs = ((new != old) & ~(new.isna() & old.isna())).any(axis=1).to_numpy()
+    parts = [part.assign(Event=event) for part, event in ((opened, OPENED), (closed, CLOSED), (new[differs], CHANGED))]
+    return pd.concat(parts).rename_axis('Key').reset_index()
+
+
+def data_stamp(versions):
+    """Newest source mtime behind a snapshot's {dataset: (size, mtime_ns)} versions"""
+    return max((version[1] for version in versions.values() if version), default=0)
+
+
+def _empty_log():
+    return pd.DataFrame({column: pd.Series(dtype=object) for column in LOG_COLUMNS}).astype({'Day': np.int32, 'Event': np.int8})
+
+
+def _to_table(deltas):
+    """Delta rows as an Arrow table in LOG_SCHEMA"""
+    arrays = [pa.array(deltas['Day'].to_numpy(), pa.int32()), pa.array(deltas['Event'].to_numpy(), pa.int8())]
+    for column in TEXT_COLUMNS:
+        values = deltas[column].astype(object).to_numpy()
+        arrays.append(pa.array(values, pa.string(), from_pandas=True).dictionary_encode())
+    return pa.Table.from_arrays(arrays, schema=LOG_SCHEMA)
+
+
+def _to_log(days):
+    """One log frame, oldest day first, from per-day Arrow tables (or frames without pyarrow)"""
+    parts = [days[day] for day in sorted(days)]
+    if pa is not None:
+        # Dictionaries are unified once, straight into categoricals
+        return pa.concat_tables([LOG_SCHEMA.empty_table()] + parts).to_pandas()[LOG_COLUMNS]
+    log = pd.concat([_empty_log()] + parts, ignore_index=True)
+    return log.astype({column: 'category' for column in TEXT_COLUMNS})
+
+
+def _state(log, table, day):
+    rows = log[(log['Table'] == table).to_numpy() & (log['Day'] <= day).to_numpy()]
+    last = rows.drop_duplicates('Key', keep='last')
+    last = last[last['Event'] != CLOSED]
+    return last.set_index(last['Key'].astype(object))[TRACKED_COLUMNS[table]].astype(object).rename_axis(None)
+
+
+class HistoryStore:
+    """Append-only daily delta log with as-of and per-day count queries"""
+
+    def __init__(self, folder=None, cache_size=64):
+        self.folder = folder or os.path.join(site_data.DATA_DIR, HISTORY_DIR_NAME)
+        self._days = {}        # day number -> that day's delta rows (Arrow table or frame)
+        self._versions = {}    # file name -> (size, mtime_ns)
+        self._stamps = {}      # day number -> data_stamp the day was built from
+        self._log = _to_log({})
+        self._generation = 0
+        self._lock = threading.RLock()
+        self._cache = LRUCache(cache_size)
+
+    def _path(self, day):
+        return os.path.join(self.folder, f"{np.datetime64(day, 'D')}.arrow")
+
+    def _refresh(self):
+        # Other processes append to the same folder; pick up their day files
+        if pa is None or not os.path.isdir(self.folder):
+            return
+        versions = {}
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith('.arrow'):
+                stat = entry.stat()
+                versions[entry.name] = (stat.st_size, stat.st_mtime_ns)
+        if versions == self._versions:
+            return
+        days, stamps = {}, {}
+        for name, version in versions.items():
+            day = int(np.datetime64(name[:-len('.arrow')], 'D').astype(np.int64))
+            if self._versions.get(name) == version and day in self._days:
+                days[day], stamps[day] = self._days[day], self._stamps.get(day, 0)
+                continue
+            deltas, stamp = self._read(os.path.join(self.folder, name))
+            if deltas is not None:
+                days[day], stamps[day] = deltas, stamp
+        self._versions = versions
+        self._stamps = stamps
+        self._set_days(days)
+
+    def _read(self, path):
+        try:
+            with pa.memory_map(path, 'r') as mapped:
+                table = pa.ipc.open_file(mapped).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None, 0
+        try:
+            meta = json.loads((table.schema.metadata or {}).get(_META_KEY, b''))
+        except ValueError:
+            return None, 0
+        if meta.get('format') != HISTORY_FORMAT or not table.schema.equals(LOG_SCHEMA):
+            return None, 0
+        return table.replace_schema_metadata(None), meta.get('stamp', 0)
+
+    def _write(self, day, table, stamp):
+        if pa is None:
+            return
+        path = self._path(day)
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            meta = {'format': HISTORY_FORMAT, 'stamp': stamp}
+            table = table.replace_schema_metadata({_META_KEY: json.dumps(meta).encode('utf-8')})
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except (OSError, pa.ArrowException) as e:
+            log.warning("Could not write history for %s: %s", np.datetime64(day, 'D'), e)
+
+    @contextmanager
+    def _ingest_lock(self):
+        # Serializes read-diff-write across the worker processes sharing the folder
+        if pa is None or fcntl is None:
+            yield
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        with open(os.path.join(self.folder, LOCK_NAME), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _note_version(self, day):
+        # Our own write needs no re-read on the next refresh
+        path = self._path(day)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self._versions.pop(os.path.basename(path), None)
+            return
+        self._versions[os.path.basename(path)] = (stat.st_size, stat.st_mtime_ns)
+
+    def _set_days(self, days):
+        self._days = days
+        self._log = _to_log(days)
+        self._generation += 1
+        self._cache.clear()
+
+    def ingest(self, day, states, stamp=0):
+        """Record ``states`` ({table: tracked columns by key}) as the state on ``day``
+
+        Re-ingesting the latest day replaces its deltas, unless the day was already
+        built from newer sources (``stamp``, see data_stamp); earlier days are final.
+        A day without changes is still recorded (as an empty file), so days()
+        lists every ingested day. Returns the number of delta rows for the day,
+        or None when the ingest was skipped.
+        """
+        day = day_number(day)
+        with self._lock, self._ingest_lock():
+            self._refresh()
+            if self._days and day < max(self._days):
+                raise ValueError(f"History already extends past {np.datetime64(day, 'D')}")
+            if day in self._days and stamp < self._stamps.get(day, 0):
+                # Another process already recorded this day from newer files
+                return None
+            parts = []
+            for table, current in states.items():
+                deltas = diff_states(_state(self._log, table, day - 1), current)
+                parts.append(deltas.assign(Day=day, Table=table))
+            deltas = pd.concat(parts, ignore_index=True).reindex(columns=LOG_COLUMNS)
+            deltas = deltas.astype({'Day': np.int32, 'Event': np.int8})
+            entry = _to_table(deltas) if pa is not None else deltas
+            days = dict(self._days)
+            days[day] = entry
+            if pa is not None:
+                self._write(day, entry, stamp)
+                self._note_version(day)
+            self._stamps[day] = stamp
+            self._set_days(days)
+            return len(deltas)
+
+    def record(self, snapshot):
+        """Snapshot listener: ingest the snapshot's offline sites and alarms as of its date"""
+        states = current_states(snapshot.frames['db'], snapshot.alarms.table)
+        self.ingest(snapshot.as_of, states, data_stamp(snapshot.versions))
+
+    def days(self):
+        """Recorded days, oldest first, as dates"""
+        with self._lock:
+            self._refresh()
+            return [np.datetime64(day, 'D').astype(object) for day in sorted(self._days)]
+
+    def state_as_of(self, table, as_of=None):
+        """Tracked columns of every key open on ``as_of``, indexed by key"""
+        day = day_number(as_of)
+        with self._lock:
+            self._refresh()
+            log, generation = self._log, self._generation
+        return self._cache.get_or_compute(('state', generation, table, day), lambda: _state(log, table, day))
+
+    def daily_counts(self, table, dimension=None, start=None, end=None):
+        """Open keys per day (rows) and ``dimension`` value (columns) from ``start`` to ``end``
+
+        Without a dimension the single column 'Total' is counted. Days default to
+        the ingested range, up to the last ingested day even when nothing changed.
+        """
+        with self._lock:
+            self._refresh()
+            log, generation = self._log, self._generation
+            recorded = sorted(self._days)
+        if not recorded:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='Day'))
+        start = day_number(start) if start is not None else recorded[0]
+        end = day_number(end) if end is not None else recorded[-1]
+        key = ('counts', generation, table, dimension, start, end)
+        return self._cache.get_or_compute(key, lambda: self._daily_counts(log, table, dimension, start, end))
+
+    @staticmethod
+    def _daily_counts(log, table, dimension, start, end):
+        rows = log[(log['Table'] == table).to_numpy() & (log['Day'] <= end).to_numpy()]
+        # Day order within each key, so shift() yields the key's previous value
+        rows = rows.sort_values('Key', kind='stable')
+        keys = rows['Key'].cat.codes
+        if dimension is None:
+            values = pd.Series('Total', index=rows.index, dtype=object)
+        else:
+            values = rows[dimension].astype(object).fillna(UNKNOWN)
+        previous = values.groupby(keys.to_numpy()).shift()
+        event = rows['Event'].to_numpy()
+
+        # +1 where a key enters a value, -1 where it leaves one
+        days = np.maximum(rows['Day'].to_numpy(), start)
+        entering = event != CLOSED
+        leaving = event != OPENED
+        left = np.where(event == CHANGED, previous.to_numpy(), values.to_numpy())
+        steps = pd.DataFrame({
+            'Day': np.concatenate([days[entering], days[leaving]]),
+            'Label': np.concatenate([values.to_numpy()[entering], left[leaving]]),
+            'Step': np.concatenate([np.ones(entering.sum(), np.int32), -np.ones(leaving.sum(), np.int32)]),
+        })
+        counts = steps.pivot_table(index='Day', columns='Label', values='Step', aggfunc='sum', fill_value=0)
+        counts = counts.reindex(np.arange(start, end + 1), fill_value=0).cumsum()
+        counts = counts.loc[:, (counts != 0).any()]
+        counts.index = pd.DatetimeIndex(counts.index.to_numpy().astype('datetime64[D]'), name='Day')
+        counts.columns.name = None
+        return counts
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_store():
+    """Process-wide history store"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = HistoryStore()
+        return _shared
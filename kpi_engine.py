@@ -0,0 +1,108 @@
+from typing import NamedTuple
+
+import pandas as pd
+
+from offline_cube import OfflineCube, UNKNOWN
+
+# KPI summary for the RMS offline dashboard.
+# Every KPI is a marginal of the OfflineCube, which is built in one pass over the
+# categorical codes, so the frame is scanned exactly once.
+
+TOP_REASONS = 10
+
+
+class OfflineSummary(NamedTuple):
+    """Immutable KPI summary of DB.csv"""
+    total: int
+    enfra: int
+    sms_ld: int
+    others: int
+    region_domain: tuple   # ((region, domain, count), ...)
+    aging_by_domain: tuple  # ((domain, ((bucket, count), ...)), ...)
+    reasons: tuple         # ((reason, count), ...) top reasons, most common first
+
+    @property
+    def offline(self):
+        return self.enfra + self.sms_ld
+
+    def aging_for(self, domain):
+        """Aging bucket counts for one domain as an ordered dict"""
+        return dict(dict(self.aging_by_domain).get(domain, ()))
+
+    def reasons_series(self):
+        return pd.Series(dict(self.reasons), dtype='int64')
+
+    def region_frame(self):
+        return pd.DataFrame(list(self.region_domain), columns=['Region', 'Domain', 'count'])
+
+
+class SpareSummary(NamedTuple):
+    """Spare-inventory KPIs from the DC CTs / SPDs sheet"""
+    received: int
+    used: int
+    available: int
+    balance: tuple         # ((spare, received, used, available), ...)
+    used_by_region: tuple  # ((sub region, used count), ...) most used first
+    unlogged: tuple        # ((spare, used in balance - used in log), ...) where they disagree
+
+
+def summarize_spares(usage, balance):
+    """Spare totals, per-spare balance and usage, reconciled against the usage log"""
+    logged = usage.groupby('Spare Name', observed=True)['Used Count'].sum()
+    rows = tuple(
+        (str(row['Spare Name']), int(row['Spare Received']), int(row['Spare Used']), int(row['Available Balance']))
+        for _, row in balance.iterrows()
+    )
+    by_region = usage.groupby('Sub Region', observed=True)['Used Count'].sum().sort_values(ascending=False, kind='stable')
+    unlogged = tuple(
+        (spare, used - int(logged.get(spare, 0)))
+        for spare, _, used, _ in rows
+        if used != int(logged.get(spare, 0))
+    )
+    return SpareSummary(
+        received=sum(row[1] for row in rows),
+        used=sum(row[2] for row in rows),
+        available=sum(row[3] for row in rows),
+        balance=rows,
+        used_by_region=tuple((str(region), int(count)) for region, count in by_region.items()),
+        unlogged=unlogged,
+    )
+
+
+def summarize(df):
+    """Compute every dashboard KPI from one pass over the frame"""
+    return summarize_cube(OfflineCube.from_frame(df))
+
+
+def summarize_cube(cube):
+    """Compute every dashboard KPI as slices of an OfflineCube"""
+    total = cube.total()
+    enfra = cube.total({'Domain': 'Enfra'})
+    sms_ld = cube.total({'Domain': 'SMS LD'})
+    domains = [d for d in cube.labels[cube.dimensions.index('Domain')] if d != UNKNOWN]
+
+    region_domain = cube.crosstab('Cluster', 'Domain')
+    region_rows = tuple(
+        (region, domain, int(region_domain.at[region, domain]))
+        for region in region_domain.index
+        for domain in domains
+        if region_domain.at[region, domain]
+    )
+
+    aging_by_domain = tuple(
+        (domain, tuple(cube.counts_by('Aging', {'Domain': domain}).items()))
+        for domain in domains
+    )
+
+    # Sites without a reason are online, so they are left out of the top reasons
+    top_reasons = tuple(cube.counts_by('Reason', sort=True, top=TOP_REASONS).items())
+
+    return OfflineSummary(
+        total=total,
+        enfra=enfra,
+        sms_ld=sms_ld,
+        others=total - enfra - sms_ld,
+        region_domain=region_rows,
+        aging_by_domain=aging_by_domain,
+        reasons=top_reasons,
+    )
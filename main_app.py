@@ -1,13 +1,25 @@
 import streamlit as st
 
-# Initialize session state for navigation
-if 'page' not in st.session_state:
-    st.session_state.page = 'main'
-
-# Page routing
-if st.session_state.page == 'main':
-    # Run the main dashboard
-    exec(open('streamlit_dashboard.py').read())
-elif st.session_state.page == 'rms_database':
-    # Run the RMS database page
-    exec(open('rms_database.py').read())
\ No newline at end of file
+import alarms_database
+import rms_database
+import streamlit_dashboard
+
+# Page modules are imported (and compiled) once per process; a rerun only calls render()
+PAGES = {
+    'main': streamlit_dashboard,
+    'rms_database': rms_database,
+    'alarms_database': alarms_database,
+}
+
+def run():
+    """Dispatch the current Streamlit rerun to the page stored in session state"""
+    # Initialize session state for navigation
+    if 'page' not in st.session_state:
+        st.session_state.page = 'main'
+
+    page = PAGES.get(st.session_state.page, PAGES['main'])
+    st.set_page_config(**page.PAGE_CONFIG)
+    page.render()
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,110 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# OLAP-style count cube over DB.csv.
+# Built once per data version by counting the distinct label combinations; only
+# non-empty cells are stored (free-text axes like Reason would make a dense
+# cube larger than the table). Every chart is then a filter + bincount over the
+# cells, costing O(non-empty cells) instead of O(rows).
+
+CUBE_DIMENSIONS = ('Domain', 'Cluster', 'Aging', 'Reason', 'Sub Region')
+UNKNOWN = 'Unknown'
+
+
+def category_codes(series):
+    """Categorical codes and labels for a column, NaN mapped to a trailing 'Unknown' slot"""
+    if not isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype('category')
+    labels = [str(label) for label in series.cat.categories] + [UNKNOWN]
+    codes = series.cat.codes.to_numpy().astype(np.int64)
+    codes[codes < 0] = len(labels) - 1
+    return codes, labels
+
+
+def joint_counts(df, columns):
+    """Non-empty cells of the joint histogram of ``columns``
+
+    Returns (cells, counts, labels): one row of label codes per cell, its row
+    count, and the label list of each axis.
+    """
+    axes = [category_codes(df[column]) for column in columns]
+    if not len(df):
+        return np.zeros((0, len(axes)), dtype=np.int64), np.zeros(0, dtype=np.int64), [labels for _, labels in axes]
+    cells, counts = np.unique(np.column_stack([codes for codes, _ in axes]), axis=0, return_counts=True)
+    return cells, counts, [labels for _, labels in axes]
+
+
+def aging_sort_key(label):
+    """Order aging buckets like '1 - 05 Days' < '6 - 15 Days' < '100+ Days' < 'Unknown'"""
+    match = re.match(r'\s*(\d+)', label)
+    return (0, int(match.group(1))) if match else (1, label)
+
+
+class OfflineCube:
+    """Read-only sparse count cube with one axis per dimension"""
+
+    def __init__(self, cells, counts, labels, dimensions):
+        cells.setflags(write=False)
+        counts.setflags(write=False)
+        self.cells = cells
+        self.counts = counts
+        self.labels = [tuple(axis) for axis in labels]
+        self.dimensions = tuple(dimensions)
+        self._index = [{label: i for i, label in enumerate(axis)} for axis in self.labels]
+
+    @classmethod
+    def from_frame(cls, df, dimensions=CUBE_DIMENSIONS):
+        """Build the cube from a cleaned DB frame in one pass"""
+        cells, counts, labels = joint_counts(df, dimensions)
+        if 'Aging' in dimensions:
+            # Keep aging buckets in chronological order along their axis
+            axis = dimensions.index('Aging')
+            order = sorted(range(len(labels[axis])), key=lambda i: aging_sort_key(labels[axis][i]))
+            rank = np.empty(len(order), dtype=np.int64)
+            rank[order] = np.arange(len(order))
+            cells = cells.copy()
+            cells[:, axis] = rank[cells[:, axis]]
+            labels[axis] = [labels[axis][i] for i in order]
+        return cls(cells, counts, labels, dimensions)
+
+    def _select(self, where):
+        """Mask of the cells matching ``where``"""
+        mask = np.ones(len(self.counts), dtype=bool)
+        for dimension, wanted in (where or {}).items():
+            axis = self.dimensions.index(dimension)
+            if isinstance(wanted, str):
+                wanted = [wanted]
+            positions = [self._index[axis][w] for w in wanted if w in self._index[axis]]
+            mask &= np.isin(self.cells[:, axis], positions)
+        return mask
+
+    def _totals(self, axis, mask):
+        return np.bincount(self.cells[mask, axis], weights=self.counts[mask], minlength=len(self.labels[axis])).astype(np.int64)
+
+    def total(self, where=None):
+        """Number of rows matching ``where`` ({dimension: label or [labels]})"""
+        return int(self.counts[self._select(where)].sum())
+
+    def counts_by(self, dimension, where=None, drop_unknown=True, sort=False, top=None):
+        """Counts along one dimension for the rows matching ``where``, as an ordered dict"""
+        axis = self.dimensions.index(dimension)
+        totals = self._totals(axis, self._select(where))
+        pairs = [(label, int(count)) for label, count in zip(self.labels[axis], totals)
+                 if count and not (drop_unknown and label == UNKNOWN)]
+        if sort:
+            pairs.sort(key=lambda pair: -pair[1])
+        if top is not None:
+            pairs = pairs[:top]
+        return dict(pairs)
+
+    def crosstab(self, row_dimension, column_dimension, where=None):
+        """2-D slice of the cube as a DataFrame"""
+        rows = self.dimensions.index(row_dimension)
+        columns = self.dimensions.index(column_dimension)
+        mask = self._select(where)
+        shape = (len(self.labels[rows]), len(self.labels[columns]))
+        key = self.cells[mask, rows] * shape[1] + self.cells[mask, columns]
+        table = np.bincount(key, weights=self.counts[mask], minlength=shape[0] * shape[1]).astype(np.int64).reshape(shape)
+        return pd.DataFrame(table, index=list(self.labels[rows]), columns=list(self.labels[columns]))
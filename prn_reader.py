@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+from csv_encoding import SAMPLE_SIZE, decode_as, decode_bytes, detect_encoding
+
+# Reader for Excel's fixed-width "Formatted Text (.prn)" exports.
+# Fields sit at fixed character positions and may run into each other
+# ("31 - 100 DaysRectifier FAN OFF"), so columns are cut by a declared spec rather
+# than split on whitespace. Lines are sliced as one numpy character grid per chunk.
+
+# (column, start, end) character positions; end=None runs to the end of the line.
+# Names match the alarm CSVs (the .prn header truncates "Days Passed").
+RECTIFIER_FAN_COLUMNS = [
+    ('Site Id', 0, 15),
+    ('Sub Region', 15, 32),
+    ('Region', 32, 46),
+    ('Beginning', 46, 60),
+    ('Days Passed', 60, 68),
+    ('Aging', 68, 81),
+    ('Alarm', 81, 98),
+    ('ES POC', 98, 113),
+    ('SMS POC', 113, 128),
+    ('History | Issue', 128, 154),
+    ('Summarize', 154, 172),
+    ('Domain', 172, None),
+]
+
+CHUNK_ROWS = 50000
+
+
+def _is_header(line, colspecs):
+    return line.lstrip().startswith(colspecs[0][0])
+
+
+def parse_lines(lines, colspecs=RECTIFIER_FAN_COLUMNS):
+    """Cut decoded fixed-width lines into a frame of stripped strings
+
+    Blank lines and repeated header lines are skipped. Blank fields become NaN,
+    and a column that is blank on every line is all-NaN float, as read_csv gives.
+    """
+    lines = [line.rstrip('\r\n') for line in lines if line.strip() and not _is_header(line, colspecs)]
+    if not lines:
+        return pd.DataFrame({name: pd.Series(dtype=str) for name, _, _ in colspecs})
+
+    width = max(max(len(line) for line in lines), max(end or start + 1 for _, start, end in colspecs))
+    grid = np.array(lines, dtype=f'U{width}').view('U1').reshape(len(lines), width)
+    columns = {}
+    for name, start, end in colspecs:
+        end = width if end is None else end
+        field = np.ascontiguousarray(grid[:, start:end]).view(f'U{end - start}').ravel()
+        values = np.char.strip(field)
+        blank = values == ''
+        if blank.all():
+            columns[name] = np.full(len(lines), np.nan)
+        else:
+            columns[name] = pd.Series(values).mask(blank)
+    return pd.DataFrame(columns)
+
+
+def read_prn_bytes(raw, colspecs=RECTIFIER_FAN_COLUMNS):
+    """Parse a whole .prn export already in memory
+
+    The encoding and repaired byte count are stored in ``df.attrs`` like
+    csv_encoding.read_csv_bytes.
+    """
+    text, encoding, repaired = decode_bytes(raw)
+    df = parse_lines(text.splitlines(), colspecs)
+    df.attrs['encoding'] = encoding
+    df.attrs['repaired_bytes'] = repaired
+    return df
+
+
+def iter_prn(path, colspecs=RECTIFIER_FAN_COLUMNS, chunk_rows=CHUNK_ROWS):
+    """Stream a .prn export as frames of at most ``chunk_rows`` lines, never loading it whole"""
+    with open(path, 'rb') as f:
+        encoding = detect_encoding(f.read(SAMPLE_SIZE))
+        f.seek(0)
+        batch = []
+        for raw_line in f:
+            batch.append(raw_line)
+            if len(batch) >= chunk_rows:
+                df = _parse_batch(batch, encoding, colspecs)
+                batch = []
+                # Skip chunks that held only blank padding lines
+                if not df.empty:
+                    yield df
+        if batch:
+            df = _parse_batch(batch, encoding, colspecs)
+            if not df.empty:
+                yield df
+
+
+def _parse_batch(batch, encoding, colspecs):
+    text, repaired = decode_as(b''.join(batch), encoding)
+    df = parse_lines(text.splitlines(), colspecs)
+    df.attrs['encoding'] = encoding
+    df.attrs['repaired_bytes'] = repaired
+    return df
@@ -1,42 +1,18 @@
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from dash import Dash, dcc, html, Input, Output, callback
+from dash import Dash, dcc, html, Input, Output, clientside_callback
 import dash_bootstrap_components as dbc
-from datetime import datetime
 import numpy as np
 
-# Load the data with proper encoding
-try:
-    df = pd.read_csv('DB.csv', encoding='utf-8', on_bad_lines='skip')
-except UnicodeDecodeError:
-    try:
-        df = pd.read_csv('DB.csv', encoding='latin1', on_bad_lines='skip')
-    except UnicodeDecodeError:
-        df = pd.read_csv('DB.csv', encoding='cp1252', on_bad_lines='skip')
+from site_data import load_dataset
 
-# Data preprocessing
-df.columns = df.columns.str.strip()  # Remove any leading/trailing spaces from column names
-
-# Convert 'Offline Date' to datetime
-df['Offline Date'] = pd.to_datetime(df['Offline Date'], errors='coerce')
-
-# Fill NaN values in 'Days Passed' with 0
-df['Days Passed'] = df['Days Passed'].fillna(0)
-
-# Create Aging categories for better visualization
-df['Aging Category'] = df['Aging'].fillna('Unknown')
+# Load the cleaned, typed DB.csv frame from the shared site-data store
+df = load_dataset('db')
 
 # Initialize the Dash app with Bootstrap theme
 app = Dash(__name__, external_stylesheets=[dbc.themes.CYBORG])
 
-# Function to get current date and time in required format
-def get_current_datetime():
-    now = datetime.now()
-    day = now.strftime("%A")[:3].upper()  # Get day abbreviation (MON, TUE, etc.)
-    date_time = now.strftime("| %d-%b-%y | %H:%M:%S")
-    return f"{day} {date_time}"
-
 # App layout
 app.layout = dbc.Container([
     dbc.Row([
@@ -52,7 +28,7 @@ app.layout = dbc.Container([
         ], width=2)
     ]),
     
-    # Interval component to update time every second
+    # Interval component to update time every second (ticks in the browser only)
     dcc.Interval(
         id='interval-component',
         interval=1000,  # Update every second
@@ -60,13 +36,23 @@ app.layout = dbc.Container([
     )
 ], fluid=True)
 
-# Callback to update the current time
-@callback(
+# Client-side callback to update the current time.
+# Runs in the browser, so the clock costs no HTTP request or server callback per tick.
+# Format matches the Streamlit pages: "MON | 18-Oct-26 | 14:05:09"
+clientside_callback(
+    """
+    function(n) {
+        const days = ['SUN', 'MON', 'TUE', 'WED', 'THU', 'FRI', 'SAT'];
+        const months = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'];
+        const pad = (value) => String(value).padStart(2, '0');
+        const now = new Date();
+        return `${days[now.getDay()]} | ${pad(now.getDate())}-${months[now.getMonth()]}-${pad(now.getFullYear() % 100)} | ` +
+            `${pad(now.getHours())}:${pad(now.getMinutes())}:${pad(now.getSeconds())}`;
+    }
+    """,
     Output('current-time', 'children'),
     Input('interval-component', 'n_intervals')
 )
-def update_time(n):
-    return get_current_datetime()
 
 # Run the app
 if __name__ == '__main__':
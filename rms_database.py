@@ -5,37 +5,37 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
 
-# Set page config
-st.set_page_config(
+from data_snapshot import get_worker
+from history_store import get_store
+
+# Page configuration, applied by whichever script is the Streamlit entry point
+PAGE_CONFIG = dict(
     page_title="RMS Database Analysis",
     layout="wide"
 )
 
-# Load data from CSV files with multiple encoding fallbacks
-@st.cache_data
-def load_csv_with_fallback(filepath):
-    """Load CSV with multiple encoding fallbacks"""
-    encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']
-    for encoding in encodings:
-        try:
-            return pd.read_csv(filepath, encoding=encoding)
-        except UnicodeDecodeError:
-            continue
-        except Exception as e:
-            st.warning(f"Error with {filepath} using {encoding}: {e}")
-            continue
-    st.error(f"Failed to load {filepath} with all attempted encodings")
-    return None
-
-@st.cache_data
-def load_data():
+# One background worker per process loads the CSVs, builds the KPI summary and
+# chart series, and swaps in a new snapshot when the data changes.
+@st.cache_resource
+def snapshot_worker():
+    return get_worker()
+
+def load_snapshot():
+    """Latest published data snapshot; reruns never parse or aggregate"""
     try:
-        # Load the main DB.csv file
-        db_data = load_csv_with_fallback('DB.csv')
-        return db_data
+        snapshot = snapshot_worker().current()
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
+    db_data = snapshot.frames['db']
+    if db_data.attrs.get('repaired_bytes'):
+        st.info(f"DB.csv: decoded as {db_data.attrs['encoding']}, repaired {db_data.attrs['repaired_bytes']} byte(s)")
+    for column, count in db_data.attrs.get('unparsed_dates', {}).items():
+        st.warning(f"DB.csv: {count} {column} value(s) could not be read as dates")
+    return snapshot
+
+# Offline trend breakdowns; 'Total' is the overall count
+TREND_DIMENSIONS = ['Total', 'Domain', 'Cluster', 'Sub Region', 'Reason']
 
 # Function to get current date and time in required format
 def get_current_datetime():
@@ -44,101 +44,6 @@ def get_current_datetime():
     date_time = now.strftime("| %d-%b-%y | %H:%M:%S")
     return f"{day} {date_time}"
 
-# Function to analyze Column L (Domain) data
-def analyze_column_l_data(df):
-    """Analyze Column L (Domain) data from the DataFrame"""
-    if df is None or df.empty:
-        return None
-    
-    try:
-        # Count domains
-        enfra_count = len(df[df['Domain'] == 'Enfra'])
-        sms_ld_count = len(df[df['Domain'] == 'SMS LD'])
-        others_count = len(df) - enfra_count - sms_ld_count
-        
-        return {
-            'enfra': enfra_count,
-            'smsLd': sms_ld_count,
-            'others': others_count,
-            'total': len(df)
-        }
-    except Exception as e:
-        st.error(f"Error analyzing Column L data: {e}")
-        return None
-
-# Function to analyze region data
-def analyze_region_data(df):
-    """Analyze region data from the DataFrame"""
-    if df is None or df.empty:
-        return None
-    
-    try:
-        # Group by region and domain
-        region_analysis = df.groupby(['Region', 'Domain']).size().reset_index(name='count')
-        return region_analysis
-    except Exception as e:
-        st.error(f"Error analyzing region data: {e}")
-        return None
-
-# Function to analyze aging data
-def analyze_aging_data(df):
-    """Analyze aging data from the DataFrame"""
-    if df is None or df.empty:
-        return None
-    
-    try:
-        # Assuming there's a date column for aging analysis
-        # This is a simplified example - you may need to adjust based on your actual data structure
-        if 'Last Updated' in df.columns:
-            # Convert to datetime and calculate days since last update
-            df['Last Updated'] = pd.to_datetime(df['Last Updated'], errors='coerce')
-            df['days_since_update'] = (datetime.now() - df['Last Updated']).dt.days
-            
-            # Categorize by aging periods
-            aging_categories = {
-                '0-7 days': len(df[df['days_since_update'] <= 7]),
-                '8-30 days': len(df[(df['days_since_update'] > 7) & (df['days_since_update'] <= 30)]),
-                '31-90 days': len(df[(df['days_since_update'] > 30) & (df['days_since_update'] <= 90)]),
-                '90+ days': len(df[df['days_since_update'] > 90])
-            }
-            return aging_categories
-        else:
-            # Return dummy data if no date column found
-            return {
-                '0-7 days': 25,
-                '8-30 days': 35,
-                '31-90 days': 20,
-                '90+ days': 15
-            }
-    except Exception as e:
-        st.error(f"Error analyzing aging data: {e}")
-        return None
-
-# Function to analyze reasons data
-def analyze_reasons_data(df):
-    """Analyze reasons data from the DataFrame"""
-    if df is None or df.empty:
-        return None
-    
-    try:
-        # Assuming there's a 'Reason' column
-        if 'Reason' in df.columns:
-            reasons_count = df['Reason'].value_counts().head(10)
-            return reasons_count
-        else:
-            # Return dummy data if no reason column found
-            return pd.Series({
-                'Power Failure': 45,
-                'Network Issue': 32,
-                'Hardware Failure': 28,
-                'Software Bug': 15,
-                'Maintenance': 12,
-                'Other': 8
-            })
-    except Exception as e:
-        st.error(f"Error analyzing reasons data: {e}")
-        return None
-
 # Function to create pie chart
 def create_pie_chart(data, title):
     """Create a pie chart using Plotly"""
@@ -196,6 +101,28 @@ def create_bar_chart(data, title, x_label, y_label):
         st.error(f"Error creating bar chart: {e}")
         return None
 
+# Function to create trend line chart
+def create_trend_chart(counts, title):
+    """Line chart of a per-day count frame (one line per column)"""
+    if counts is None or counts.empty:
+        return None
+
+    try:
+        fig = go.Figure(data=[
+            go.Scatter(x=counts.index, y=counts[column], mode='lines', name=str(column))
+            for column in counts.columns
+        ])
+        fig.update_layout(
+            title=title,
+            xaxis_title="Date",
+            yaxis_title="Offline Sites",
+            height=400
+        )
+        return fig
+    except Exception as e:
+        st.error(f"Error creating trend chart: {e}")
+        return None
+
 # Main app
 def main():
     # Custom CSS
@@ -374,18 +301,15 @@ def main():
     # Footer text
     st.markdown('<div class="footer-text">Database created by - Abbas Enterprises - Lakhi - 2025</div>', unsafe_allow_html=True)
 
-    # Load data
-    df = load_data()
+    # Read the precomputed snapshot; a reload by the worker shows up on the next rerun
+    snapshot = load_snapshot()
     
-    if df is not None:
-        # Analyze data
-        column_l_analysis = analyze_column_l_data(df)
-        region_analysis = analyze_region_data(df)
-        aging_analysis = analyze_aging_data(df)
-        reasons_analysis = analyze_reasons_data(df)
+    if snapshot is not None:
+        summary = snapshot.summary
+        charts = snapshot.charts
         
         # Display stats grid
-        if column_l_analysis:
+        if summary:
             st.markdown("""
             <div class="stats-grid">
                 <div class="stat-card">
@@ -406,10 +330,10 @@ def main():
                 </div>
             </div>
             """.format(
-                column_l_analysis['enfra'],
-                column_l_analysis['smsLd'],
-                column_l_analysis['enfra'] + column_l_analysis['smsLd'],
-                column_l_analysis['total']
+                summary.enfra,
+                summary.sms_ld,
+                summary.offline,
+                summary.total
             ), unsafe_allow_html=True)
         
         # Display charts
@@ -418,11 +342,11 @@ def main():
         # Chart 1: Enfra Vs SMS LD
         col1, col2, col3 = st.columns(3)
         with col1:
-            if column_l_analysis:
+            if summary:
                 pie_data = {
-                    'Enfra': column_l_analysis['enfra'],
-                    'SMS LD': column_l_analysis['smsLd'],
-                    'Others': column_l_analysis['others']
+                    'Enfra': summary.enfra,
+                    'SMS LD': summary.sms_ld,
+                    'Others': summary.others
                 }
                 fig1 = create_pie_chart(pie_data, "Enfra Vs SMS LD")
                 if fig1:
@@ -430,66 +354,68 @@ def main():
         
         # Chart 2: RMS Offline Count Cluster Wise (Enfra Domain)
         with col2:
-            # Dummy data for demonstration
-            cluster_data_enfra = {
-                'Jacob Abad': 25,
-                'Larkana': 30,
-                'Sukkur': 20,
-                'Khairpur': 15,
-                'Dadu': 10
-            }
-            fig2 = create_bar_chart(cluster_data_enfra, "RMS Offline Count Cluster Wise (Enfra Domain)", "Cluster", "Count")
-            if fig2:
-                st.plotly_chart(fig2, use_container_width=True)
+            if charts:
+                cluster_data_enfra = charts['cluster_enfra']
+                fig2 = create_bar_chart(cluster_data_enfra, "RMS Offline Count Cluster Wise (Enfra Domain)", "Cluster", "Count")
+                if fig2:
+                    st.plotly_chart(fig2, use_container_width=True)
         
         # Chart 3: RMS Offline Count Cluster Wise (SMS LD Domain)
         with col3:
-            # Dummy data for demonstration
-            cluster_data_smsld = {
-                'Jacob Abad': 15,
-                'Larkana': 20,
-                'Sukkur': 25,
-                'Khairpur': 10,
-                'Dadu': 5
-            }
-            fig3 = create_bar_chart(cluster_data_smsld, "RMS Offline Count Cluster Wise (SMS LD Domain)", "Cluster", "Count")
-            if fig3:
-                st.plotly_chart(fig3, use_container_width=True)
+            if charts:
+                cluster_data_smsld = charts['cluster_smsld']
+                fig3 = create_bar_chart(cluster_data_smsld, "RMS Offline Count Cluster Wise (SMS LD Domain)", "Cluster", "Count")
+                if fig3:
+                    st.plotly_chart(fig3, use_container_width=True)
         
         # Second row of charts
         col4, col5, col6 = st.columns(3)
         
         # Chart 4: RMS Offline Count with Aging (Enfra Domain)
         with col4:
-            if aging_analysis:
-                fig4 = create_bar_chart(aging_analysis, "RMS Offline Count with Aging (Enfra Domain)", "Aging Period", "Count")
+            if charts:
+                fig4 = create_bar_chart(charts['aging_enfra'], "RMS Offline Count with Aging (Enfra Domain)", "Aging Period", "Count")
                 if fig4:
                     st.plotly_chart(fig4, use_container_width=True)
         
         # Chart 5: RMS Offline Count with Aging (SMS LD Domain)
         with col5:
-            # Dummy data for SMS LD aging
-            smsld_aging = {
-                '0-7 days': 20,
-                '8-30 days': 25,
-                '31-90 days': 15,
-                '90+ days': 10
-            }
-            fig5 = create_bar_chart(smsld_aging, "RMS Offline Count with Aging (SMS LD Domain)", "Aging Period", "Count")
-            if fig5:
-                st.plotly_chart(fig5, use_container_width=True)
+            if charts:
+                smsld_aging = charts['aging_smsld']
+                fig5 = create_bar_chart(smsld_aging, "RMS Offline Count with Aging (SMS LD Domain)", "Aging Period", "Count")
+                if fig5:
+                    st.plotly_chart(fig5, use_container_width=True)
         
         # Chart 6: RMS Offline Reasons
         with col6:
-            if reasons_analysis is not None:
-                fig6 = create_bar_chart(reasons_analysis, "RMS Offline Reasons", "Reason", "Count")
+            if charts:
+                fig6 = create_bar_chart(charts['reasons'], "RMS Offline Reasons", "Reason", "Count")
                 if fig6:
                     st.plotly_chart(fig6, use_container_width=True)
         
         st.markdown('</div>', unsafe_allow_html=True)
+
+        # Offline trend from the day-by-day history; counts come from the delta log, not stored copies
+        history = get_store()
+        days = history.days()
+        if len(days) > 1:
+            trend_col, range_col = st.columns(2)
+            with trend_col:
+                trend_by = st.selectbox("Trend by", TREND_DIMENSIONS, key="trend_by")
+            with range_col:
+                picked = st.date_input("Date range", (days[0], days[-1]), min_value=days[0], max_value=days[-1], key="trend_range")
+            start, end = (picked[0], picked[-1]) if len(picked) else (days[0], days[-1])
+            counts = history.daily_counts('db', None if trend_by == 'Total' else trend_by, start, end)
+            fig7 = create_trend_chart(counts, f"RMS Offline Trend ({trend_by})")
+            if fig7:
+                st.plotly_chart(fig7, use_container_width=True)
         
     else:
         st.error("Failed to load data. Please check the DB.csv file.")
 
+# Entry point used by the main_app page router
+render = main
+
 if __name__ == "__main__":
+    st.set_page_config(**PAGE_CONFIG)
     main()
\ No newline at end of file
@@ -0,0 +1,149 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Server-side aggregation for the 3D offline-devices scatter.
+# Above SCATTER_MAX_POINTS rows the plot shows one marker per
+# (Days Passed bucket, Device Brand, Sub Region) bin sized by its count, so the
+# figure payload is bounded by the number of bins instead of the number of rows.
+# Clicking a bin marker drills down to the raw points of that bin.
+
+SCATTER_MAX_POINTS = int(os.environ.get('RMS_SCATTER_MAX_POINTS', 2000))
+
+# Upper edges (inclusive) of the Days Passed buckets; the last bucket is open-ended
+DAY_BUCKET_EDGES = np.array([5, 10, 15, 30, 60, 100, 180, 365, 730])
+DAY_BUCKET_LABELS = ['0-5', '6-10', '11-15', '16-30', '31-60', '61-100', '101-180',
+                     '181-365', '366-730', '730+']
+
+RAW_COLUMNS = ['Days Passed', 'Device Brand', 'Sub Region', 'Aging Category', 'Site Id', 'Reason']
+BIN_MARKER = 'bin'
+
+
+def _bin_codes(filter_index, positions):
+    df = filter_index.df
+    days = df['Days Passed'].to_numpy()[positions]
+    buckets = np.searchsorted(DAY_BUCKET_EDGES, days, side='left')
+    brands = df['Device Brand'].cat.codes.to_numpy()[positions].astype(np.int64)
+    regions = df['Sub Region'].cat.codes.to_numpy()[positions].astype(np.int64)
+    return days, buckets, brands, regions
+
+
+def bin_id(bucket, brand, region):
+    """Click-through identifier stored in a bin marker's customdata"""
+    return json.dumps([BIN_MARKER, int(bucket), brand, region])
+
+
+def clicked_bin(click_data):
+    """Bin identifier from a Dash clickData payload, or None for a raw point"""
+    try:
+        custom = click_data['points'][0]['customdata']
+    except (TypeError, KeyError, IndexError):
+        return None
+    value = custom[0] if isinstance(custom, (list, tuple)) and custom else custom
+    if isinstance(value, str) and value.startswith(f'["{BIN_MARKER}"'):
+        return value
+    return None
+
+
+def aggregate(filter_index, positions):
+    """One row per non-empty bin with its count and mean Days Passed"""
+    df = filter_index.df
+    days, buckets, brands, regions = _bin_codes(filter_index, positions)
+    brand_labels = list(df['Device Brand'].cat.categories)
+    region_labels = list(df['Sub Region'].cat.categories)
+
+    # Shift codes by one so NaN (-1) gets its own slot
+    n_brands, n_regions = len(brand_labels) + 1, len(region_labels) + 1
+    keys = (buckets * n_brands + brands + 1) * n_regions + regions + 1
+    size = len(DAY_BUCKET_LABELS) * n_brands * n_regions
+    counts = np.bincount(keys, minlength=size)
+    day_sums = np.bincount(keys, weights=days, minlength=size)
+
+    occupied = np.flatnonzero(counts)
+    bucket_idx, rest = np.divmod(occupied, n_brands * n_regions)
+    brand_idx, region_idx = np.divmod(rest, n_regions)
+    brand_names = [brand_labels[i - 1] if i else 'Unknown' for i in brand_idx]
+    region_names = [region_labels[i - 1] if i else 'Unknown' for i in region_idx]
+    return pd.DataFrame({
+        'Days Passed': day_sums[occupied] / counts[occupied],
+        'Device Brand': brand_names,
+        'Sub Region': region_names,
+        'Days Bucket': [DAY_BUCKET_LABELS[i] for i in bucket_idx],
+        'Count': counts[occupied],
+        'Bin': [bin_id(b, brand, region) for b, brand, region in zip(bucket_idx, brand_names, region_names)],
+    })
+
+
+def bin_positions(filter_index, positions, bin_key):
+    """Subset of ``positions`` that falls into the bin identified by ``bin_key``"""
+    _, bucket, brand, region = json.loads(bin_key)
+    df = filter_index.df
+    _, buckets, brands, regions = _bin_codes(filter_index, positions)
+    brand_code = _label_code(df['Device Brand'], brand)
+    region_code = _label_code(df['Sub Region'], region)
+    return positions[(buckets == bucket) & (brands == brand_code) & (regions == region_code)]
+
+
+def _label_code(series, label):
+    categories = list(series.cat.categories)
+    return categories.index(label) if label in categories else -1
+
+
+def _layout(fig, title):
+    fig.update_layout(
+        title=title,
+        scene=dict(
+            xaxis_title='Days Passed',
+            yaxis_title='Device Brand',
+            zaxis_title='Sub Region'
+        ),
+        height=600
+    )
+    return fig
+
+
+def scatter_figure(filter_index, positions, drill_bin=None, max_points=None):
+    """3D scatter of the selected rows: raw points when small, sized bins otherwise"""
+    max_points = SCATTER_MAX_POINTS if max_points is None else max_points
+    if drill_bin is not None:
+        positions = bin_positions(filter_index, positions, drill_bin)
+
+    if len(positions) == 0:
+        fig = go.Figure()
+        fig.update_layout(title="No Data Available", height=600)
+        return fig
+
+    if drill_bin is not None or len(positions) <= max_points:
+        title = "3D View of Offline Devices by Days, Brand, and Region"
+        if drill_bin is not None:
+            _, bucket, brand, region = json.loads(drill_bin)
+            title = f"{brand} / {region} / {DAY_BUCKET_LABELS[bucket]} days (click a point to go back)"
+        rows = filter_index.rows(positions, RAW_COLUMNS)
+        fig = px.scatter_3d(
+            rows,
+            x='Days Passed',
+            y='Device Brand',
+            z='Sub Region',
+            color='Aging Category',
+            # Some exports carry -1 days, which Plotly rejects as a marker size
+            size=rows['Days Passed'].clip(lower=0),
+            hover_data=['Site Id', 'Reason']
+        )
+        return _layout(fig, title)
+
+    bins = aggregate(filter_index, positions)
+    fig = px.scatter_3d(
+        bins,
+        x='Days Passed',
+        y='Device Brand',
+        z='Sub Region',
+        color='Count',
+        size='Count',
+        hover_data=['Days Bucket', 'Count'],
+        custom_data=['Bin']
+    )
+    return _layout(fig, f"3D View of {len(positions)} Offline Devices in {len(bins)} bins (click a bin to drill down)")
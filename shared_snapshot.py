@@ -0,0 +1,243 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+
+import site_data
+from data_watcher import DataWatcher, POLL_INTERVAL
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+try:
+    import fcntl
+except ImportError:
+    # No flock (Windows): every process parses for itself
+    fcntl = None
+
+# Cleaned tables shared between WSGI worker processes.
+# Whichever process first sees a CSV change takes a file lock, parses the CSVs once
+# and writes one Arrow IPC file per dataset into shared memory (/dev/shm when
+# available). A small manifest naming the current files is then replaced
+# atomically. Every worker memory-maps those files instead of parsing, so the
+# Arrow buffers are held once in the page cache however many workers run.
+
+log = logging.getLogger(__name__)
+
+SHM_ROOT = os.environ.get('RMS_SHM_DIR') or ('/dev/shm' if os.path.isdir('/dev/shm') else tempfile.gettempdir())
+# One directory per data folder, so separate checkouts on a host never share a manifest
+_DATA_KEY = hashlib.blake2b(os.path.abspath(site_data.DATA_DIR).encode('utf-8'), digest_size=8).hexdigest()
+SNAPSHOT_DIR = os.path.join(SHM_ROOT, f'rms_snapshot-{_DATA_KEY}')
+MANIFEST_NAME = 'manifest.json'
+LOCK_NAME = 'publish.lock'
+SNAPSHOT_FORMAT = 1
+# Generations kept on disk; older files are unlinked (already-mapped readers keep theirs)
+KEEP_GENERATIONS = 2
+# Seconds start() waits for a first snapshot before giving up
+START_TIMEOUT = float(os.environ.get('RMS_SHARED_START_TIMEOUT', 60.0))
+_META_KEY = b'rms_snapshot'
+
+
+def enabled():
+    """True when snapshots can be shared (pyarrow and flock available, not switched off)"""
+    return pa is not None and fcntl is not None and os.environ.get('RMS_SHARED_SNAPSHOT', '1') != '0'
+
+
+def manifest_path():
+    return os.path.join(SNAPSHOT_DIR, MANIFEST_NAME)
+
+
+def read_manifest():
+    """Current manifest ({format, generation, token, versions, files}), or None"""
+    try:
+        with open(manifest_path(), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if manifest.get('format') == SNAPSHOT_FORMAT else None
+
+
+@contextmanager
+def publisher_lock():
+    """Yield True when this process may publish, False when another one is doing it"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    with open(os.path.join(SNAPSHOT_DIR, LOCK_NAME), 'a') as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_table(path, df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = dict(table.schema.metadata or {})
+    metadata[_META_KEY] = json.dumps({'attrs': dict(df.attrs)}).encode('utf-8')
+    table = table.replace_schema_metadata(metadata)
+    tmp_path = f"{path}.tmp"
+    with pa.OSFile(tmp_path, 'wb') as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    os.replace(tmp_path, path)
+
+
+def publish(token, frames, versions):
+    """Write a new generation of frames and switch the manifest to it; returns the manifest"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    generation = f"{time.time_ns()}-{os.getpid()}"
+    files = {}
+    for name, df in frames.items():
+        files[name] = f"{name}.{generation}.arrow"
+        _write_table(os.path.join(SNAPSHOT_DIR, files[name]), df)
+
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'generation': generation,
+        'token': token,
+        'versions': {name: list(version) for name, version in versions.items()},
+        'files': files,
+    }
+    tmp_path = f"{manifest_path()}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, manifest_path())
+    _prune(generation)
+    return manifest
+
+
+def _prune(current):
+    generations = {}
+    for filename in os.listdir(SNAPSHOT_DIR):
+        if filename.endswith('.arrow'):
+            generations.setdefault(filename.split('.')[1], []).append(filename)
+    stale = sorted(g for g in generations if g != current)[:-(KEEP_GENERATIONS - 1) or None]
+    for generation in stale:
+        for filename in generations[generation]:
+            try:
+                os.unlink(os.path.join(SNAPSHOT_DIR, filename))
+            except OSError:
+                pass
+
+
+def attach(manifest):
+    """Memory-map the frames named by ``manifest``
+
+    Arrow buffers stay in the shared mapping; pandas only builds its column
+    views (and the small category dictionaries) on top of them.
+    """
+    frames = {}
+    for name, filename in manifest['files'].items():
+        with pa.memory_map(os.path.join(SNAPSHOT_DIR, filename), 'r') as mapped:
+            table = pa.ipc.open_file(mapped).read_all()
+        df = table.to_pandas(split_blocks=True)
+        raw = (table.schema.metadata or {}).get(_META_KEY)
+        if raw:
+            df.attrs.update(json.loads(raw).get('attrs', {}))
+        frames[name] = df
+    return frames
+
+
+class SharedDataWatcher(DataWatcher):
+    """DataWatcher whose frames come from the shared snapshot instead of a local parse"""
+
+    def __init__(self, names=None, interval=POLL_INTERVAL):
+        super().__init__(names, interval)
+        self.generation = None
+        self._frames = {}
+
+    def start(self, timeout=START_TIMEOUT):
+        """Wait until some process has published a snapshot, then keep watching
+
+        Raises TimeoutError when nothing is published within ``timeout`` seconds,
+        e.g. because a data file is missing or fails to load.
+        """
+        deadline = time.monotonic() + timeout
+        while self.generation is None:
+            self.check()
+            if self.generation is None:
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"No shared snapshot was published within {timeout:g}s")
+                time.sleep(0.1)
+        return super().start()
+
+    def frames(self):
+        with self._lock:
+            return dict(self._frames), dict(self._versions)
+
+    def _file_versions(self):
+        versions = {}
+        for name in self.names:
+            try:
+                versions[name] = list(site_data.dataset_version(name))
+            except OSError:
+                # File missing or mid-replace: keep whatever was published last
+                pass
+        return versions
+
+    def _is_current(self, manifest, versions):
+        if manifest is None:
+            return False
+        published = manifest['versions']
+        return all(published.get(name) == version for name, version in versions.items())
+
+    def _republish(self, versions):
+        with publisher_lock() as acquired:
+            if not acquired:
+                # Another worker is parsing; pick its result up on the next check
+                return
+            manifest = read_manifest()
+            if self._is_current(manifest, versions):
+                return
+            frames = {}
+            for name in self.names:
+                try:
+                    frames[name] = site_data.load_dataset(name)
+                except Exception as e:
+                    self._report_failure(name, versions.get(name), e)
+                    return
+            token = (manifest['token'] if manifest else 0) + 1
+            # Record the versions seen before loading: a file replaced mid-load then still
+            # differs from the manifest and is republished on the next check
+            publish(token, frames, versions)
+
+    def check(self):
+        """Publish if the CSVs changed, then attach any newer generation; returns the changed names"""
+        versions = self._file_versions()
+        if not self._is_current(read_manifest(), versions):
+            self._republish(versions)
+
+        manifest = read_manifest()
+        if manifest is None or manifest['generation'] == self.generation:
+            return []
+        try:
+            frames = attach(manifest)
+        except (OSError, pa.ArrowInvalid):
+            # Pruned between reading the manifest and mapping it; retry next check
+            return []
+
+        new_versions = {name: tuple(version) for name, version in manifest['versions'].items()}
+        with self._lock:
+            changed = [name for name in self.names if new_versions.get(name) != self._versions.get(name)]
+            self._frames = frames
+            self._versions = new_versions
+            self.generation = manifest['generation']
+            # Tokens come from the manifest so every worker reports the same data version
+            self.token = manifest['token']
+            token = self.token
+
+        for callback in list(self._listeners):
+            try:
+                callback(changed, token)
+            except Exception:
+                log.exception("Data change listener failed")
+        return changed
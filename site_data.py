@@ -0,0 +1,299 @@
+import hashlib
+import io
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+import category_normalize
+import data_cache
+import frame_schema
+import prn_reader
+import table_split
+from csv_encoding import decode_as, read_csv_bytes
+
+# Shared data-access layer for every dashboard.
+# Each CSV is parsed and cleaned once per file version (size + mtime); the cleaned
+# frame is also persisted by data_cache so later processes skip the parse entirely.
+
+log = logging.getLogger(__name__)
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DATA_FILES = {
+    'db': 'DB.csv',
+    'dse': 'DSE.csv',
+    'rectifier': 'Rectifier.csv',
+    'spd': 'SPD.csv',
+    'events': 'events.csv',
+    'locations': 'Locations.csv',
+    'tenants': 'tenant.csv',
+    'rectifier_fan': 'Rectifier Fan.prn',
+    'spare_usage': 'DC CTs and SPDs.csv',
+    'spare_balance': 'DC CTs and SPDs.csv',
+}
+
+# Files holding several tables side by side: dataset name -> position of its table
+SIDE_BY_SIDE_TABLES = {'spare_usage': 0, 'spare_balance': 1}
+
+# Alarm logs that share the Site Id / Beginning / Days Passed / Aging schema.
+# They are append-mostly, so a grown file is reloaded by parsing only its new tail.
+ALARM_DATASETS = ['dse', 'rectifier', 'spd', 'events', 'rectifier_fan']
+
+DATE_FORMAT = '%d-%b-%y'
+DATE_COLUMNS = ['Offline Date', 'Beginning', 'Date']
+
+CATEGORY_COLUMNS = [
+    'Device Brand', 'Sub Region', 'Region', 'Cluster', 'Team lead', 'TL',
+    'ES POC', 'SMS POC', 'Aging', 'Aging Category', 'Reason', 'Summarised',
+    'Summarize', 'History', 'History | Issue', 'Domain', 'Armoured', 'Alarm',
+    'Operator', 'Spare Name', 'Team', 'Status',
+]
+
+_cache = {}
+_lock = threading.Lock()
+# Unparsed-date counts last logged per dataset
+_reported_dates = {}
+
+
+def data_path(name):
+    """Absolute path of a dataset's source file"""
+    return os.path.join(DATA_DIR, DATA_FILES[name])
+
+
+def file_version(path):
+    """Cheap version token for a file: (size, mtime in ns)"""
+    stat = os.stat(path)
+    return (stat.st_size, stat.st_mtime_ns)
+
+
+def dataset_version(name):
+    """Version token of a dataset's source file"""
+    return file_version(data_path(name))
+
+
+def parse_dates(values, date_format=DATE_FORMAT):
+    """Parse date strings of one known format, decoding each distinct string once
+
+    Returns (datetimes, unparsed) where ``unparsed`` counts the non-blank values
+    that did not match the format.
+    """
+    codes, uniques = pd.factorize(values)
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = pd.to_datetime(uniques, format=date_format, errors='coerce').to_numpy()
+    failed = pd.isna(parsed) & (uniques.astype(str).str.strip() != '').to_numpy()
+    # Missing values (code -1) take the trailing NaT, which also covers all-blank columns
+    dates = np.append(parsed, np.datetime64('NaT'))[codes]
+    unparsed = int(failed[codes[codes >= 0]].sum())
+    return pd.Series(dates, index=values.index, name=values.name), unparsed
+
+
+def clean_frame(df):
+    """Strip, type and categorical-encode a raw RMS export"""
+    df.columns = df.columns.str.strip()
+
+    # Exports carry trailing separators: drop blank columns and blank rows
+    blank_columns = [c for c in df.columns if c.startswith('Unnamed:') and df[c].isna().all()]
+    df = df.drop(columns=blank_columns).dropna(how='all').reset_index(drop=True)
+
+    text_columns = [c for c in df.columns if pd.api.types.is_string_dtype(df[c])]
+    for column in text_columns:
+        df[column] = df[column].str.strip()
+
+    unparsed = {}
+    for column in DATE_COLUMNS:
+        if column in df.columns:
+            df[column], count = parse_dates(df[column])
+            if count:
+                unparsed[column] = count
+    df.attrs['unparsed_dates'] = unparsed
+
+    if 'Days Passed' in df.columns:
+        df['Days Passed'] = pd.to_numeric(df['Days Passed'], errors='coerce').fillna(0)
+
+    if 'Aging' in df.columns:
+        df['Aging Category'] = df['Aging'].fillna('Unknown')
+
+    # Columns that came in all blank stay numeric NaN rather than empty categories
+    for column in CATEGORY_COLUMNS:
+        if column in text_columns or (column == 'Aging Category' and column in df.columns):
+            df[column] = df[column].astype('category')
+
+    return frame_schema.compact_frame(df)
+
+
+def _header_end(raw):
+    return raw.find(b'\n') + 1
+
+
+def _fingerprint(prefix):
+    # The whole ingested prefix: hashing is far cheaper than the parse it lets us skip
+    return hashlib.blake2b(prefix, digest_size=16)
+
+
+def _remember_offset(df, raw, offset, rows):
+    """Record how much of the source has been ingested, for the next tail-only reload"""
+    df.attrs['source_offset'] = offset
+    df.attrs['source_rows'] = rows
+    df.attrs['source_fingerprint'] = _fingerprint(raw[:offset]).hexdigest()
+
+
+def _is_fixed_width(path):
+    return path.lower().endswith('.prn')
+
+
+def _load_full(path, table=None):
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if table is not None:
+        parsed = table_split.split_tables(raw)[table]
+    elif _is_fixed_width(path):
+        parsed = prn_reader.read_prn_bytes(raw)
+    else:
+        parsed = read_csv_bytes(raw, on_bad_lines='skip')
+    rows = len(parsed)
+    df = clean_frame(parsed)
+    _remember_offset(df, raw, len(raw), rows)
+    return df
+
+
+def _append_frames(old, new):
+    """Concatenate two cleaned frames, or None when their schemas disagree"""
+    if list(old.columns) != list(new.columns):
+        return None
+    columns = {}
+    for column in old.columns:
+        old_column, new_column = old[column], new[column]
+        old_cat = isinstance(old_column.dtype, pd.CategoricalDtype)
+        new_cat = isinstance(new_column.dtype, pd.CategoricalDtype)
+        # A text column that is blank on one side came in as float NaN; it takes the other side's type
+        if old_cat and not new_cat and new_column.isna().all():
+            new_column, new_cat = new_column.astype(old_column.dtype), True
+        elif new_cat and not old_cat and old_column.isna().all():
+            old_column, old_cat = old_column.astype(new_column.dtype), True
+        if old_cat != new_cat:
+            return None
+        if old_cat:
+            columns[column] = pd.Series(union_categoricals([old_column, new_column], ignore_order=True))
+        else:
+            columns[column] = pd.concat([old_column, new_column], ignore_index=True)
+    return pd.DataFrame(columns)
+
+
+def _load_tail(path, previous):
+    """Parse only the bytes appended since ``previous`` was loaded
+
+    Returns None when the file shrank or the ingested prefix changed, in which
+    case the caller falls back to a full reload.
+    """
+    offset = previous.attrs.get('source_offset')
+    encoding = previous.attrs.get('encoding')
+    if offset is None or encoding is None:
+        return None
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < offset:
+            return None
+        prefix = f.read(offset)
+        header = prefix[:_header_end(prefix)]
+        digest = _fingerprint(prefix)
+        if not header or not prefix.endswith(b'\n') or digest.hexdigest() != previous.attrs.get('source_fingerprint'):
+            return None
+        tail = f.read()
+
+    # Leave an unterminated last line for the next reload
+    tail = tail[:tail.rfind(b'\n') + 1]
+    if not tail:
+        return previous
+
+    text, repaired = decode_as(header + tail, 'utf-8' if encoding == 'utf-8-sig' else encoding)
+    if _is_fixed_width(path):
+        parsed = prn_reader.parse_lines(text.splitlines())
+    else:
+        parsed = pd.read_csv(io.StringIO(text), on_bad_lines='skip')
+    unparsed = {}
+    if parsed.empty:
+        df = previous.copy(deep=False)
+    else:
+        tail_frame = clean_frame(parsed)
+        unparsed = tail_frame.attrs.get('unparsed_dates', {})
+        df = _append_frames(previous, tail_frame)
+        if df is None:
+            return None
+
+    digest.update(tail)
+    df.attrs.update(previous.attrs)
+    df.attrs['repaired_bytes'] = previous.attrs.get('repaired_bytes', 0) + repaired
+    previous_unparsed = previous.attrs.get('unparsed_dates', {})
+    df.attrs['unparsed_dates'] = {
+        column: previous_unparsed.get(column, 0) + unparsed.get(column, 0)
+        for column in set(previous_unparsed) | set(unparsed)
+    }
+    df.attrs['source_offset'] = offset + len(tail)
+    df.attrs['source_rows'] = previous.attrs.get('source_rows', 0) + len(parsed)
+    df.attrs['source_fingerprint'] = digest.hexdigest()
+    return df
+
+
+def load_dataset(name):
+    """Return the cleaned frame for a dataset, re-reading only when the file changed
+
+    Alarm logs that only grew are extended from their new tail instead of being
+    re-parsed. Text categories are canonicalized by category_normalize on every
+    load. The returned frame is shared between callers and must be treated
+    as read-only.
+    """
+    path = data_path(name)
+    version = file_version(path)
+    table = SIDE_BY_SIDE_TABLES.get(name)
+    part = name if table is not None else None
+    with _lock:
+        cached = _cache.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        df = data_cache.load(path, version, part)
+        if df is None and name in ALARM_DATASETS:
+            previous = cached[1] if cached is not None else data_cache.load_any(path)
+            if previous is not None:
+                df = _load_tail(path, previous)
+            if df is not None:
+                data_cache.store(path, version, df)
+        if df is None:
+            df = _load_full(path, table)
+            data_cache.store(path, version, df, part=part)
+        df = category_normalize.normalize_frame(df)
+        # Callers read the counts from df.attrs; the log only notes when they change
+        unparsed = dict(df.attrs.get('unparsed_dates', {}))
+        if unparsed != _reported_dates.get(name, {}):
+            for column, count in unparsed.items():
+                log.warning("%s: %d %s value(s) not in %s format", DATA_FILES[name], count, column, DATE_FORMAT)
+        _reported_dates[name] = unparsed
+        _cache[name] = (version, df)
+        return df
+
+
+def stream_prn(path, chunk_rows=prn_reader.CHUNK_ROWS):
+    """Cleaned chunks of a fixed-width .prn export, for files too large to load at once
+
+    Each chunk has the alarm CSV schema; categories are per chunk.
+    """
+    for chunk in prn_reader.iter_prn(path, chunk_rows=chunk_rows):
+        yield category_normalize.normalize_frame(clean_frame(chunk))
+
+
+def load_all():
+    """Load every dataset in DATA_FILES"""
+    return {name: load_dataset(name) for name in DATA_FILES}
+
+
+def count_values(series, fill=None):
+    """value_counts over observed values only, optionally counting NaN as ``fill``"""
+    counts = series.value_counts(dropna=fill is None)
+    counts = counts[counts > 0]
+    if fill is not None:
+        labels = counts.index.astype(object)
+        counts.index = labels.where(pd.notna(labels), fill)
+        counts = counts.groupby(level=0, sort=False).sum().sort_values(ascending=False, kind='stable')
+    return counts
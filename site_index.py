@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+import site_data
+from geo_index import parse_coordinates
+
+# Site-keyed join across every export.
+# DB and the alarm logs use "Site Id", Locations/tenant "ENF Site ID" and the spares
+# log "Site ID". IDs are normalized once per data version and each frame's rows are
+# grouped by site, so one site's rows in every table are a dict lookup away.
+# A one-row-per-site profile table (brand, location, operators, alarm counts) is
+# precomputed from the same grouping for the site-wise and tenant pages.
+
+SITE_ID_COLUMNS = ['Site Id', 'ENF Site ID', 'Site ID']
+
+# Dash look-alikes that show up when IDs are pasted through Excel or Word
+_DASHES = '‐‑‒–—−'
+_TO_HYPHEN = str.maketrans(_DASHES, '-' * len(_DASHES))
+
+
+def site_column(df):
+    """Name of the site ID column of a frame, or None"""
+    for column in SITE_ID_COLUMNS:
+        if column in df.columns:
+            return column
+    return None
+
+
+def normalize_site_ids(series):
+    """Canonical site IDs: upper case, no whitespace, plain hyphens"""
+    ids = series.astype('string').str.upper().str.replace(r'\s+', '', regex=True)
+    ids = ids.str.translate(_TO_HYPHEN)
+    return ids.mask(ids == '')
+
+
+def normalize_site_id(site_id):
+    """Scalar form of normalize_site_ids, for lookups"""
+    site = ''.join(str(site_id).upper().split()).translate(_TO_HYPHEN)
+    return site or None
+
+
+def _group_positions(keys):
+    """{site id: row positions} for a Series of normalized IDs"""
+    codes, uniques = pd.factorize(keys)
+    located = np.flatnonzero(codes >= 0)
+    order = located[np.argsort(codes[located], kind='stable')]
+    bounds = np.flatnonzero(np.diff(codes[order])) + 1
+    return {
+        uniques[codes[group[0]]]: group
+        for group in np.split(order, bounds)
+        if len(group)
+    }
+
+
+class SiteIndex:
+    """Row positions of every site in every frame, plus a per-site profile table"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self._keys = {}
+        self._rows = {}
+        for name, df in frames.items():
+            column = site_column(df)
+            if column is None:
+                continue
+            self._keys[name] = normalize_site_ids(df[column])
+            for site, positions in _group_positions(self._keys[name]).items():
+                self._rows.setdefault(site, {})[name] = positions
+        self.table = self._profile_table()
+
+    def __contains__(self, site_id):
+        return normalize_site_id(site_id) in self._rows
+
+    def __len__(self):
+        return len(self._rows)
+
+    def positions(self, site_id):
+        """{dataset name: row positions} for one site"""
+        return self._rows.get(normalize_site_id(site_id), {})
+
+    def lookup(self, site_id):
+        """{dataset name: that site's rows} across every frame that mentions it"""
+        return {
+            name: self.frames[name].take(positions)
+            for name, positions in self.positions(site_id).items()
+        }
+
+    def profile(self, site_id):
+        """One site's row of the profile table, or None"""
+        site = normalize_site_id(site_id)
+        if site not in self._rows:
+            return None
+        return self.table.loc[site]
+
+    def _first(self, name, columns):
+        df = self.frames.get(name)
+        if df is None:
+            return pd.DataFrame(columns=columns)
+        columns = [c for c in columns if c in df.columns]
+        # Categories differ between tables, so labels are joined as plain objects
+        frame = df[columns].apply(
+            lambda column: column.astype(object) if isinstance(column.dtype, pd.CategoricalDtype) else column
+        )
+        frame.index = self._keys[name]
+        return frame[frame.index.notna() & ~frame.index.duplicated()]
+
+    def _profile_table(self):
+        sites = pd.Index(sorted(self._rows), name='Site Id')
+        table = self._first('db', ['Device Brand', 'Sub Region', 'Cluster', 'Domain', 'Reason', 'Days Passed']).reindex(sites)
+        # As in the KPI summary, DB.csv sites without a reason are online
+        table['Offline'] = table['Reason'].notna()
+
+        if 'locations' in self.frames:
+            located = self._first('locations', ['Sub Region', 'Region', 'Latitude']).reindex(sites)
+            table['Sub Region'] = table['Sub Region'].combine_first(located['Sub Region'])
+            table['Region'] = located['Region']
+            table['Lat'], table['Lon'] = parse_coordinates(located['Latitude'])
+
+        if 'tenants' in self.frames:
+            tenants = self.frames['tenants']
+            operators = tenants['Operator'].astype(object).groupby(self._keys['tenants'].to_numpy()).agg(
+                lambda values: ', '.join(sorted(set(values.dropna())))
+            )
+            table['Operators'] = operators.reindex(sites)
+            table['Tenant Count'] = self._keys['tenants'].value_counts().reindex(sites, fill_value=0).to_numpy()
+
+        for name in site_data.ALARM_DATASETS:
+            if name in self._keys:
+                counts = self._keys[name].value_counts()
+                table[f'{name} alarms'] = counts.reindex(sites, fill_value=0).to_numpy()
+        return table
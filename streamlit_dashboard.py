@@ -5,15 +5,17 @@ import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import time
 
-# Set the page configuration
-st.set_page_config(
+# Page configuration, applied by whichever script is the Streamlit entry point
+PAGE_CONFIG = dict(
     page_title="Welcome to RMS Interactive Dashboard",
     page_icon="📊",
     layout="wide"
 )
 
-# Add custom CSS for styling
-st.markdown("""
+def render():
+    """Render the landing page"""
+    # Add custom CSS for styling
+    st.markdown("""
 <style>
     .main-header {
         text-align: center;
@@ -183,8 +185,8 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Display the main header
-st.markdown("""
+    # Display the main header
+    st.markdown("""
 <div class="main-header">
     <h1>Welcome To The Interactive World</h1>
     <p>Your Gateway To Comprehensive Data Management And Monitoring Systems</p>
@@ -192,15 +194,15 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Create buttons grid
-st.markdown('<div class="buttons-grid">', unsafe_allow_html=True)
+    # Create buttons grid
+    st.markdown('<div class="buttons-grid">', unsafe_allow_html=True)
 
-# Create columns for the buttons
-col1, col2, col3, col4 = st.columns(4)
+    # Create columns for the buttons
+    col1, col2, col3, col4 = st.columns(4)
 
-# Button 01: RMS data base
-with col1:
-    st.markdown("""
+    # Button 01: RMS data base
+    with col1:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #ff8a00, #da1b60);">
         <div class="button-icon">📊</div>
         <div class="button-text">RMS data base</div>
@@ -208,13 +210,14 @@ with col1:
     </div>
     """, unsafe_allow_html=True)
     
-    # Add navigation button
-    if st.button("Open RMS Dashboard", key="rms_database"):
-        st.switch_page("pages/1_RMS_Database.py")
+        # Add navigation button
+        if st.button("Open RMS Dashboard", key="rms_database"):
+            st.session_state.page = 'rms_database'
+            st.rerun()
     
-# Button 02: All Active Alarms Database
-with col2:
-    st.markdown("""
+    # Button 02: All Active Alarms Database
+    with col2:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #00c9ff, #92fe9d);">
         <div class="button-icon">🔔</div>
         <div class="button-text">All Active Alarms Database</div>
@@ -222,9 +225,13 @@ with col2:
     </div>
     """, unsafe_allow_html=True)
     
-# Button 03: Gallery
-with col3:
-    st.markdown("""
+        if st.button("Open Active Alarms", key="alarms_database"):
+            st.session_state.page = 'alarms_database'
+            st.rerun()
+    
+    # Button 03: Gallery
+    with col3:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #f857a6, #ff5858);">
         <div class="button-icon">🖼️</div>
         <div class="button-text">Gallery</div>
@@ -233,9 +240,9 @@ with col3:
     </div>
     """, unsafe_allow_html=True)
     
-# Button 04: RMS Brands Site wise
-with col4:
-    st.markdown("""
+    # Button 04: RMS Brands Site wise
+    with col4:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #3a7bd5, #00d2ff);">
         <div class="button-icon">📍</div>
         <div class="button-text">RMS Brands Site wise</div>
@@ -243,12 +250,12 @@ with col4:
     </div>
     """, unsafe_allow_html=True)
 
-# Second row of buttons
-col5, col6, col7, col8 = st.columns(4)
+    # Second row of buttons
+    col5, col6, col7, col8 = st.columns(4)
 
-# Button 05: Site SIMs
-with col5:
-    st.markdown("""
+    # Button 05: Site SIMs
+    with col5:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #56ab2f, #a8e063);">
         <div class="button-icon">📱</div>
         <div class="button-text">Site SIMs</div>
@@ -257,9 +264,9 @@ with col5:
     </div>
     """, unsafe_allow_html=True)
     
-# Button 06: Tasks / Activities
-with col6:
-    st.markdown("""
+    # Button 06: Tasks / Activities
+    with col6:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #6a11cb, #2575fc);">
         <div class="button-icon">✅</div>
         <div class="button-text">Tasks / Activities</div>
@@ -267,9 +274,9 @@ with col6:
     </div>
     """, unsafe_allow_html=True)
     
-# Button 07: Mapping
-with col7:
-    st.markdown("""
+    # Button 07: Mapping
+    with col7:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #ff416c, #ff4b2b);">
         <div class="button-icon">🗺️</div>
         <div class="button-text">Mapping</div>
@@ -277,9 +284,9 @@ with col7:
     </div>
     """, unsafe_allow_html=True)
     
-# Button 08: Tenants Information
-with col8:
-    st.markdown("""
+    # Button 08: Tenants Information
+    with col8:
+        st.markdown("""
     <div class="interactive-button" style="border-top: 3px solid linear-gradient(90deg, #8e2de2, #4a00e0);">
         <div class="button-icon">📞</div>
         <div class="button-text">Tenants Information</div>
@@ -287,10 +294,10 @@ with col8:
     </div>
     """, unsafe_allow_html=True)
 
-st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
 
-# Under construction notice
-st.markdown("""
+    # Under construction notice
+    st.markdown("""
 <div class="under-construction">
     <div class="construction-icon">🚧</div>
     <h2>Under Construction</h2>
@@ -299,13 +306,18 @@ st.markdown("""
 </div>
 """, unsafe_allow_html=True)
 
-# Footer
-st.markdown("""
+    # Footer
+    st.markdown("""
 <div class="footer">
     <p>RMS Interactive Dashboard &copy; 2025 Abbas Enterprises</p>
 </div>
 """, unsafe_allow_html=True)
 
-# Display current time
-current_time = datetime.now().strftime("%A, %B %d, %Y | %I:%M:%S %p")
-st.sidebar.markdown(f"<div style='text-align: right; font-weight: bold; padding: 12px; background: rgba(0,0,0,0.3); border-radius: 12px;'>{current_time}</div>", unsafe_allow_html=True)
\ No newline at end of file
+    # Display current time
+    current_time = datetime.now().strftime("%A, %B %d, %Y | %I:%M:%S %p")
+    st.sidebar.markdown(f"<div style='text-align: right; font-weight: bold; padding: 12px; background: rgba(0,0,0,0.3); border-radius: 12px;'>{current_time}</div>", unsafe_allow_html=True)
+
+if __name__ == "__main__":
+    # Running this file directly still goes through the page router
+    from main_app import run
+    run()
\ No newline at end of file
@@ -0,0 +1,63 @@
+import io
+
+import pandas as pd
+
+from csv_encoding import decode_bytes
+
+# Loader for Excel sheets saved with several tables next to each other.
+# The CSV is read once as a grid of strings; columns that are blank on every row
+# separate the tables, and each run of filled columns becomes its own frame with
+# the first filled row of that run as its header.
+
+# Footer rows Excel users add under a table; they are recomputed from the rows instead
+TOTAL_LABELS = {'Total', 'Grand Total'}
+
+
+def column_blocks(grid):
+    """(start, end) column ranges of the tables in a header-less grid"""
+    filled = grid.notna().any(axis=0).to_numpy()
+    blocks = []
+    start = None
+    for position, has_values in enumerate(filled):
+        if has_values and start is None:
+            start = position
+        elif not has_values and start is not None:
+            blocks.append((start, position))
+            start = None
+    if start is not None:
+        blocks.append((start, len(filled)))
+    return blocks
+
+
+def _typed(values):
+    """A string column as numbers when every filled value is numeric"""
+    numbers = pd.to_numeric(values, errors='coerce')
+    if numbers.notna().sum() == values.notna().sum():
+        return numbers
+    return values
+
+
+def split_tables(raw):
+    """Parse raw CSV bytes holding side-by-side tables into one frame per table
+
+    Blank rows are dropped, numeric columns are typed and total rows are left
+    out. The encoding and repaired byte count are stored in each frame's attrs.
+    """
+    text, encoding, repaired = decode_bytes(raw)
+    grid = pd.read_csv(io.StringIO(text), header=None, dtype=str)
+    grid = grid.apply(lambda column: column.str.strip()).replace('', None)
+
+    tables = []
+    for start, end in column_blocks(grid):
+        block = grid.iloc[:, start:end].dropna(how='all')
+        header = [str(label) for label in block.iloc[0]]
+        body = block.iloc[1:]
+        body = body[~body.iloc[:, 0].isin(TOTAL_LABELS)]
+        table = pd.DataFrame({
+            label: _typed(body.iloc[:, i].reset_index(drop=True))
+            for i, label in enumerate(header)
+        })
+        table.attrs['encoding'] = encoding
+        table.attrs['repaired_bytes'] = repaired
+        tables.append(table)
+    return tables
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+
+from active_alarms import ActiveAlarms, _sort_orders
+
+
+def test_sort_orders_keep_missing_last_and_ties_stable():
+    days = pd.Series([5.0, np.nan, 7.0, 5.0, np.nan, 1.0])
+    ascending, descending = _sort_orders(days)
+    assert ascending.tolist() == [5, 0, 3, 2, 1, 4]
+    assert descending.tolist() == [2, 0, 3, 5, 1, 4]
+
+
+def test_sort_orders_for_dates_and_labels():
+    beginning = pd.Series(pd.to_datetime(['2025-01-02', None, '2025-01-01']))
+    assert _sort_orders(beginning)[1].tolist() == [0, 2, 1]
+    sites = pd.Series(['B', None, 'A', 'B'], dtype='category')
+    assert _sort_orders(sites)[0].tolist() == [2, 0, 3, 1]
+    assert _sort_orders(sites)[1].tolist() == [0, 3, 2, 1]
+
+
+def test_page_sorts_descending_with_missing_last():
+    dse = pd.DataFrame({
+        'Site Id': ['S1', 'S2', 'S3', 'S4'],
+        'Alarm': 'DSE',
+        'Beginning': pd.to_datetime(['2025-01-01', '2025-01-02', '2025-01-04', '2025-01-03']),
+        'Days Passed': [10.0, 30.0, np.nan, 20.0],
+        'Sub Region': 'Sui',
+    })
+    alarms = ActiveAlarms({'dse': dse})
+    page = alarms.page(sort_by='Site Id')
+    assert page.rows['Site Id'].tolist() == ['S4', 'S3', 'S2', 'S1']
+    page = alarms.page(sort_by='Days Passed', descending=True)
+    assert page.rows['Site Id'].tolist() == ['S2', 'S4', 'S1', 'S3']
+    page = alarms.page(sort_by='Days Passed', descending=False)
+    assert page.rows['Site Id'].tolist() == ['S1', 'S4', 'S2', 'S3']
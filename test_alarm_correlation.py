@@ -0,0 +1,49 @@
+import pandas as pd
+
+from alarm_correlation import correlate
+
+
+def intervals(*rows):
+    """(site, type, start, end) rows; End is exclusive"""
+    return pd.DataFrame(rows, columns=['Site Id', 'Alarm Type', 'Start', 'End'])
+
+
+def pair(result, a, b):
+    pairs = result.pairs
+    row = pairs[(pairs['Alarm A'] == a) & (pairs['Alarm B'] == b)]
+    return None if row.empty else (int(row['Sites'].iloc[0]), int(row['Overlap Days'].iloc[0]))
+
+
+def test_overlap_days_and_sites():
+    result = correlate(intervals(
+        ('S1', 'A', 0, 10), ('S1', 'B', 5, 20), ('S1', 'C', 8, 9),
+        ('S2', 'A', 0, 3), ('S2', 'B', 3, 6),            # touching, never open together
+        ('S3', 'A', 0, 4), ('S3', 'B', 2, 4),
+    ))
+    assert pair(result, 'A', 'B') == (2, 5 + 2)
+    assert pair(result, 'A', 'C') == (1, 1)
+    assert pair(result, 'B', 'C') == (1, 1)
+    sites = result.sites.set_index('Site Id')
+    assert sorted(sites.index) == ['S1', 'S3']
+    assert sites.loc['S1', 'Max Concurrent'] == 3
+    assert sites.loc['S1', 'Overlap Days'] == 5
+    assert sites.loc['S3', 'First Overlap'] == pd.Timestamp('1970-01-03')
+
+
+def test_pairs_need_the_same_period():
+    # S1 has A+B open in one period and C+D in a later one; A and C never overlap
+    result = correlate(intervals(
+        ('S1', 'A', 0, 5), ('S1', 'B', 0, 5), ('S1', 'C', 10, 15), ('S1', 'D', 10, 15),
+        ('S2', 'A', 0, 5), ('S2', 'C', 0, 5),
+    ))
+    assert pair(result, 'A', 'B') == (1, 5)
+    assert pair(result, 'C', 'D') == (1, 5)
+    assert pair(result, 'A', 'C') == (1, 5)
+    assert pair(result, 'A', 'D') is None
+    assert pair(result, 'B', 'C') is None
+
+
+def test_no_overlaps():
+    result = correlate(intervals(('S1', 'A', 0, 5), ('S2', 'B', 0, 5)))
+    assert result.sites.empty
+    assert result.pairs.empty
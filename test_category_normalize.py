@@ -0,0 +1,46 @@
+import pandas as pd
+
+from category_normalize import clean_label, normalize_categories, normalize_frame
+
+ALIASES = {
+    '*': {'anttena required': 'Antenna Required'},
+    'Sub Region': {'day': 'Dera Allahyar', 'dera allah yar': 'Dera Allahyar'},
+}
+
+
+def test_clean_label():
+    assert clean_label('Power\xa0Fail ') == 'Power Fail'
+    assert clean_label('Gen|Fault  |Oil') == 'Gen | Fault | Oil'
+
+
+def test_aliases_and_case_variants_merge():
+    series = pd.Series(['DAY', 'Dera Allah Yar', 'sui', 'Sui', 'Sui', None], dtype='category')
+    result = normalize_categories(series, 'Sub Region', ALIASES)
+    assert list(result.cat.categories) == ['Dera Allahyar', 'Sui']
+    assert result.tolist()[:5] == ['Dera Allahyar', 'Dera Allahyar', 'Sui', 'Sui', 'Sui']
+    assert pd.isna(result.iloc[5])
+
+
+def test_most_common_spelling_wins():
+    series = pd.Series(['Power fail', 'Power Fail', 'Power fail'])
+    assert set(normalize_categories(series, 'Reason', {})) == {'Power fail'}
+
+
+def test_column_aliases_do_not_leak():
+    series = pd.Series(['DAY', 'Anttena Required'], dtype='category')
+    assert normalize_categories(series, 'Reason', ALIASES).tolist() == ['DAY', 'Antenna Required']
+
+
+def test_normalize_frame_keeps_other_columns_and_attrs():
+    df = pd.DataFrame({
+        'Sub Region': pd.Categorical(['DAY', 'Sui']),
+        'Cluster': pd.Categorical(['DAY', 'Sui']),
+        'Days Passed': [1, 2],
+    })
+    df.attrs['encoding'] = 'utf-8'
+    result = normalize_frame(df, ALIASES)
+    assert result['Sub Region'].tolist() == ['Dera Allahyar', 'Sui']
+    assert result['Cluster'].tolist() == ['DAY', 'Sui']
+    assert result.attrs['encoding'] == 'utf-8'
+    clean = pd.DataFrame({'Sub Region': pd.Categorical(['Sui'])})
+    assert normalize_frame(clean, ALIASES) is clean
@@ -0,0 +1,33 @@
+import codecs
+
+from csv_encoding import decode_bytes, detect_encoding, read_csv_bytes
+
+
+def test_detect_encoding():
+    assert detect_encoding('Site Id,Région\n'.encode('utf-8')) == 'utf-8'
+    assert detect_encoding(codecs.BOM_UTF8 + b'Site Id\n') == 'utf-8-sig'
+    assert detect_encoding('Site Id,Région\n'.encode('cp1252')) == 'cp1252'
+    # A multi-byte character cut at the end of the sample is still UTF-8
+    assert detect_encoding('Région'.encode('utf-8')[:2]) == 'utf-8'
+
+
+def test_stray_bytes_are_repaired_and_counted():
+    # A cp1252 NBSP and en dash past the sample of an otherwise UTF-8 file
+    head = 'Reason\nPower – Fail\n'.encode('utf-8')
+    text, encoding, repaired = decode_bytes(head + b'Gen\xa0Fault\nOil\x96Leak\n', sample_size=len(head))
+    assert encoding == 'utf-8'
+    assert repaired == 2
+    assert text.splitlines()[1:] == ['Power – Fail', 'Gen\xa0Fault', 'Oil–Leak']
+
+
+def test_bytes_undefined_in_cp1252_fall_back_to_latin1():
+    text, encoding, repaired = decode_bytes(b'Site\n\xe9t\xe9\x81\n')
+    assert encoding == 'cp1252'
+    assert repaired == 1
+    assert text == 'Site\nété\x81\n'
+
+
+def test_read_csv_bytes_records_encoding():
+    df = read_csv_bytes(codecs.BOM_UTF8 + b'Site Id,Sub Region\nS1,Sui\n')
+    assert list(df.columns) == ['Site Id', 'Sub Region']
+    assert df.attrs == {'encoding': 'utf-8-sig', 'repaired_bytes': 0}
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from filter_index import FilterIndex
+
+
+def frame():
+    return pd.DataFrame({
+        'Sub Region': pd.Categorical(['Sui', 'Sukkur', None, 'Sui', 'Larkana']),
+        'Device Brand': pd.Categorical(['Huawei', 'ZTE', 'ZTE', 'Huawei', 'ZTE']),
+    })
+
+
+def test_positions_match_chained_isin():
+    df = frame()
+    index = FilterIndex(df, ['Sub Region', 'Device Brand'])
+    for selections in [
+        {},
+        {'Sub Region': ['Sui']},
+        {'Sub Region': ['Sui', 'Larkana'], 'Device Brand': 'ZTE'},
+        {'Sub Region': [], 'Device Brand': ['Huawei']},
+        {'Sub Region': ['Nowhere']},
+    ]:
+        mask = np.ones(len(df), dtype=bool)
+        for column, selected in selections.items():
+            if selected:
+                mask &= df[column].isin([selected] if isinstance(selected, str) else selected).to_numpy()
+        assert index.positions(selections).tolist() == np.flatnonzero(mask).tolist()
+
+
+def test_value_counts():
+    df = frame()
+    index = FilterIndex(df, ['Sub Region'])
+    counts = index.value_counts('Sub Region', np.arange(len(df)), fill='Unknown')
+    assert counts.to_dict() == {'Sui': 2, 'Unknown': 1, 'Sukkur': 1, 'Larkana': 1}
+    assert index.value_counts('Sub Region', np.array([1, 2])).to_dict() == {'Sukkur': 1}
+
+
+def test_normalize_ignores_order_and_unknown_values():
+    index = FilterIndex(frame(), ['Sub Region', 'Device Brand'])
+    assert index.normalize({'Device Brand': ['ZTE', 'Huawei', 'Nokia']}) == index.normalize({})
+    assert index.normalize({'Sub Region': ['Sui', 'Sukkur']}) == index.normalize({'Sub Region': ['Sukkur', 'Sui', 'X']})
+    assert index.normalize({'Sub Region': ['X']}) != index.normalize({})
+
+
+def test_selecting_every_value_keeps_missing_rows_distinct():
+    index = FilterIndex(frame(), ['Sub Region', 'Device Brand'])
+    everything = {'Sub Region': index.values('Sub Region')}
+    assert index.normalize(everything) != index.normalize({})
+    assert len(index.positions(everything)) == 4
+    assert len(index.positions({})) == 5
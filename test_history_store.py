@@ -0,0 +1,74 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import history_store
+from history_store import HistoryStore
+
+DAY1, DAY2, DAY3, DAY4 = (date(2026, 1, d) for d in (1, 2, 3, 4))
+
+
+def sites(**clusters):
+    """db state with one row per site: site id -> Cluster"""
+    state = pd.DataFrame({column: 'x' for column in history_store.TRACKED_COLUMNS['db']}, index=list(clusters))
+    state['Cluster'] = list(clusters.values())
+    return {'db': state.astype(object)}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = HistoryStore(str(tmp_path))
+    store.ingest(DAY1, sites(A='Sukkur', B='Sukkur'))
+    store.ingest(DAY2, sites(A='Sukkur', B='Larkana', C='Larkana'))   # B changed, C opened
+    store.ingest(DAY3, sites(B='Larkana', C='Larkana'))                # A closed
+    return store
+
+
+def test_deltas_are_recorded(store):
+    log = store._log
+    assert list(log['Event'][log['Day'] == history_store.day_number(DAY2)]) == [
+        history_store.OPENED, history_store.CHANGED]
+    assert list(log['Key'][log['Event'] == history_store.CLOSED]) == ['A']
+
+
+def test_state_as_of(store):
+    assert store.state_as_of('db', DAY1)['Cluster'].to_dict() == {'A': 'Sukkur', 'B': 'Sukkur'}
+    assert store.state_as_of('db', DAY2)['Cluster'].to_dict() == {'A': 'Sukkur', 'B': 'Larkana', 'C': 'Larkana'}
+    assert store.state_as_of('db', DAY3)['Cluster'].to_dict() == {'B': 'Larkana', 'C': 'Larkana'}
+
+
+def test_daily_counts(store):
+    counts = store.daily_counts('db', 'Cluster')
+    assert counts['Sukkur'].tolist() == [2, 1, 0]
+    assert counts['Larkana'].tolist() == [0, 2, 2]
+    assert store.daily_counts('db')['Total'].tolist() == [2, 3, 2]
+
+
+def test_daily_counts_from_mid_history(store):
+    counts = store.daily_counts('db', 'Cluster', start=DAY2)
+    assert list(counts.index.date) == [DAY2, DAY3]
+    assert counts['Sukkur'].tolist() == [1, 0]
+    assert counts['Larkana'].tolist() == [2, 2]
+
+
+def test_reingest_replaces_the_latest_day(store):
+    store.ingest(DAY3, sites(A='Sukkur', B='Larkana', C='Sukkur'))
+    assert store.state_as_of('db', DAY3)['Cluster'].to_dict() == {'A': 'Sukkur', 'B': 'Larkana', 'C': 'Sukkur'}
+    assert store.daily_counts('db', 'Cluster')['Sukkur'].tolist() == [2, 1, 2]
+    with pytest.raises(ValueError):
+        store.ingest(DAY2, sites(A='Sukkur'))
+
+
+def test_quiet_days_are_recorded(store, tmp_path):
+    assert store.ingest(DAY4, sites(B='Larkana', C='Larkana')) == 0
+    reopened = HistoryStore(str(tmp_path))
+    assert reopened.days() == [DAY1, DAY2, DAY3, DAY4]
+    assert reopened.daily_counts('db')['Total'].tolist() == [2, 3, 2, 2]
+
+
+def test_older_sources_never_replace_a_day(tmp_path):
+    first, second = HistoryStore(str(tmp_path)), HistoryStore(str(tmp_path))
+    first.ingest(DAY1, sites(A='Sukkur', B='Sukkur'), stamp=200)
+    assert second.ingest(DAY1, sites(A='Sukkur'), stamp=100) is None
+    assert sorted(HistoryStore(str(tmp_path)).state_as_of('db', DAY1).index) == ['A', 'B']
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import site_data
+from offline_cube import UNKNOWN, OfflineCube
+
+DIMENSIONS = ('Domain', 'Aging', 'Reason')
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame({
+        'Domain': pd.Categorical(['Enfra', 'Enfra', 'SMS LD', 'Enfra', None, 'SMS LD', 'Enfra']),
+        'Aging': pd.Categorical(['100+ Days', '6 - 15 Days', '100+ Days', '1 - 05 Days', '6 - 15 Days', '100+ Days', '100+ Days']),
+        'Reason': pd.Categorical(['Power', 'Power', None, 'Theft', 'Power', 'Power', 'Power']),
+    })
+
+
+def test_only_non_empty_cells_are_stored(df):
+    cube = OfflineCube.from_frame(df, DIMENSIONS)
+    assert len(cube.counts) == 6
+    assert cube.counts.sum() == len(df)
+    assert cube.labels[1] == ('1 - 05 Days', '6 - 15 Days', '100+ Days', UNKNOWN)
+
+
+def test_counts_match_groupby(df):
+    cube = OfflineCube.from_frame(df, DIMENSIONS)
+    filled = df.apply(lambda column: column.astype(object).fillna(UNKNOWN))
+    expected = filled[filled['Domain'] == 'Enfra'].groupby('Aging').size()
+    assert cube.counts_by('Aging', {'Domain': 'Enfra'}) == expected.to_dict()
+    assert cube.counts_by('Reason', drop_unknown=False, sort=True) == {'Power': 5, 'Theft': 1, UNKNOWN: 1}
+    assert cube.total({'Domain': ['Enfra', 'SMS LD'], 'Reason': 'Power'}) == 4
+    assert cube.total({'Domain': 'Nowhere'}) == 0
+
+
+def test_crosstab_matches_pandas(df):
+    cube = OfflineCube.from_frame(df, DIMENSIONS)
+    filled = df.apply(lambda column: column.astype(object).fillna(UNKNOWN))
+    table = cube.crosstab('Domain', 'Reason')
+    expected = pd.crosstab(filled['Domain'], filled['Reason'])
+    assert table.loc[expected.index, expected.columns].equals(expected.rename_axis(None).rename_axis(None, axis=1))
+    assert table.to_numpy().sum() == len(df)
+
+
+def test_real_db_matches_groupby():
+    db = site_data.load_dataset('db')
+    cube = OfflineCube.from_frame(db)
+    assert len(cube.counts) <= len(db)
+    for dimension in cube.dimensions:
+        expected = db[dimension].astype(object).fillna(UNKNOWN).value_counts()
+        counts = cube.counts_by(dimension, drop_unknown=False)
+        assert counts == {label: int(n) for label, n in expected.items()}
+    enfra = db[db['Domain'] == 'Enfra']
+    assert cube.counts_by('Cluster', {'Domain': 'Enfra'}) == enfra['Cluster'].value_counts().loc[lambda s: s > 0].to_dict()
+    assert np.issubdtype(cube.counts.dtype, np.integer)
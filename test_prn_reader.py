@@ -0,0 +1,61 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+import prn_reader
+from prn_reader import RECTIFIER_FAN_COLUMNS, iter_prn, parse_lines, read_prn_bytes
+
+HEADER = '    Site Id        Sub Region       Region      Beginning   Days Pas    Aging          Alarm'
+
+
+def fixed_width(*values):
+    """A .prn line with each value at its column's start position"""
+    line = ''
+    for (_, start, _), value in zip(RECTIFIER_FAN_COLUMNS, values):
+        line = line.ljust(start) + value
+    return line
+
+
+ROWS = [
+    fixed_width(' ES2-TPW-04107', 'Ranipur', 'Sukkur', '8-Aug-25', '88', '31 - 100 Days', 'Rectifier FAN OFF', 'Shahid Ahmed'),
+    fixed_width(' ES2-MRP-04998', 'Ranipur', 'Sukkur', '7-Oct-25', '28', '11 - 30 Days', 'Rectifier FAN OFF'),
+]
+
+
+def test_fields_that_run_together_are_cut_by_position():
+    df = parse_lines([HEADER, ROWS[0], '', HEADER, ROWS[1]])
+    assert list(df.columns) == [name for name, _, _ in RECTIFIER_FAN_COLUMNS]
+    assert df['Site Id'].tolist() == ['ES2-TPW-04107', 'ES2-MRP-04998']
+    assert df['Aging'].tolist() == ['31 - 100 Days', '11 - 30 Days']
+    assert df['Alarm'].tolist() == ['Rectifier FAN OFF'] * 2
+    assert df['ES POC'].iloc[0] == 'Shahid Ahmed'
+    assert pd.isna(df['ES POC'].iloc[1])
+    # Blank on every line, as read_csv would give
+    assert df['Domain'].dtype == np.float64
+
+
+def test_only_headers():
+    df = parse_lines([HEADER, '   '])
+    assert df.empty
+    assert list(df.columns) == [name for name, _, _ in RECTIFIER_FAN_COLUMNS]
+
+
+def test_chunks_match_a_whole_read(tmp_path):
+    raw = '\r\n'.join([HEADER] + ROWS * 3 + ['']).encode('cp1252')
+    path = tmp_path / 'fan.prn'
+    path.write_bytes(raw)
+    whole = read_prn_bytes(raw)
+    chunks = list(iter_prn(str(path), chunk_rows=2))
+    assert len(chunks) == 4
+    # Per chunk, a column blank on every line is float rather than text
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), whole, check_dtype=False)
+    assert whole.attrs == {'encoding': 'utf-8', 'repaired_bytes': 0}
+
+
+def test_real_export_parses():
+    with open(os.path.join(os.path.dirname(prn_reader.__file__), 'Rectifier Fan.prn'), 'rb') as f:
+        df = read_prn_bytes(f.read())
+    assert len(df)
+    assert df['Site Id'].str.match(r'^[A-Z0-9]{3}-[A-Z]{3}-\d{5}$').all()
+    assert pd.to_numeric(df['Days Passed']).notna().all()
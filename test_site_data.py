@@ -0,0 +1,117 @@
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+import site_data
+
+
+def test_parse_dates_decodes_and_counts_failures():
+    values = pd.Series(['01-Jan-25', None, 'bad', '', '01-Jan-25'])
+    dates, unparsed = site_data.parse_dates(values)
+    assert dates.iloc[0] == pd.Timestamp('2025-01-01')
+    assert dates.iloc[4] == pd.Timestamp('2025-01-01')
+    assert dates.iloc[1:4].isna().all()
+    # Blank strings are missing values, not failures
+    assert unparsed == 1
+
+
+def test_parse_dates_empty_and_blank_columns():
+    for values in [pd.Series([], dtype=object), pd.Series([np.nan, np.nan]), pd.Series(['', ''])]:
+        dates, unparsed = site_data.parse_dates(values)
+        assert len(dates) == len(values)
+        assert dates.isna().all()
+        assert unparsed == 0
+
+
+def test_tail_reload_with_blank_start_date(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(site_data.DATA_DIR, 'DSE.csv'), tmp_path / 'DSE.csv')
+    monkeypatch.setattr(site_data, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(site_data, '_cache', {})
+    before = site_data.load_dataset('dse')
+
+    time.sleep(0.01)
+    with open(tmp_path / 'DSE.csv', 'ab') as f:
+        f.write(b'ES2-SUI-99999,Sui,Jacob Abad,,0,,Deepsea,,,,,,\r\n')
+    after = site_data.load_dataset('dse')
+
+    assert len(after) == len(before) + 1
+    assert pd.isna(after['Beginning'].iloc[-1])
+
+
+def test_tail_reload_notices_earlier_edits(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(site_data.DATA_DIR, 'DSE.csv'), tmp_path / 'DSE.csv')
+    monkeypatch.setattr(site_data, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(site_data, '_cache', {})
+    site_data.load_dataset('dse')
+
+    # Same-length edit to the first row plus an append
+    time.sleep(0.01)
+    raw = (tmp_path / 'DSE.csv').read_bytes()
+    raw = raw.replace(b'ES2-SUI-02705,', b'ES2-SUI-99998,', 1)
+    (tmp_path / 'DSE.csv').write_bytes(raw + b'ES2-SUI-99999,Sui,Jacob Abad,2-Jul-22,1,0-3 Days,Deepsea,Abdul Waheed,Saif ul Islam,,,,\r\n')
+    after = site_data.load_dataset('dse')
+
+    assert str(after['Site Id'].iloc[0]) == 'ES2-SUI-99998'
+    assert str(after['Site Id'].iloc[-1]) == 'ES2-SUI-99999'
+
+
+def test_tail_reload_with_blank_text_fields(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(site_data.DATA_DIR, 'SPD.csv'), tmp_path / 'SPD.csv')
+    monkeypatch.setattr(site_data, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(site_data, '_cache', {})
+    before = site_data.load_dataset('spd')
+
+    full_loads = []
+    load_full = site_data._load_full
+    monkeypatch.setattr(site_data, '_load_full', lambda *args: full_loads.append(args) or load_full(*args))
+    time.sleep(0.01)
+    with open(tmp_path / 'SPD.csv', 'ab') as f:
+        f.write(b'ES2-SUI-99999,Sui,Jacob Abad,2-Jul-22,1,0-3 Days,SPD,,,,,Enfra,\r\n')
+    after = site_data.load_dataset('spd')
+
+    assert full_loads == []
+    assert len(after) == len(before) + 1
+    assert after['ES POC'].dtype == before['ES POC'].dtype
+    assert pd.isna(after['History | Issue'].iloc[-1])
+    assert after['Domain'].iloc[-1] == 'Enfra'
+
+
+def test_tail_reload_falls_back_to_a_full_reload(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(site_data.DATA_DIR, 'DSE.csv'), tmp_path / 'DSE.csv')
+    monkeypatch.setattr(site_data, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(site_data, '_cache', {})
+    before = site_data.load_dataset('dse')
+    path = str(tmp_path / 'DSE.csv')
+
+    # A shrunken file cannot be extended
+    time.sleep(0.01)
+    raw = (tmp_path / 'DSE.csv').read_bytes()
+    first_rows = raw[:raw.index(b'\n', raw.index(b'\n') + 1) + 1]
+    (tmp_path / 'DSE.csv').write_bytes(first_rows)
+    assert site_data._load_tail(path, before) is None
+    assert len(site_data.load_dataset('dse')) == 1
+
+
+def test_tail_reload_waits_for_the_end_of_a_line(tmp_path, monkeypatch):
+    shutil.copy(os.path.join(site_data.DATA_DIR, 'DSE.csv'), tmp_path / 'DSE.csv')
+    monkeypatch.setattr(site_data, 'DATA_DIR', str(tmp_path))
+    monkeypatch.setattr(site_data, '_cache', {})
+    before = site_data.load_dataset('dse')
+
+    row = b'ES2-SUI-99999,Sui,Jacob Abad,2-Jul-22,1,0-3 Days,Deepsea,Abdul Waheed,Saif ul Islam,,,,\r\n'
+    time.sleep(0.01)
+    with open(tmp_path / 'DSE.csv', 'ab') as f:
+        f.write(row[:20])
+    partial = site_data.load_dataset('dse')
+    assert len(partial) == len(before)
+    assert partial.attrs['source_offset'] == before.attrs['source_offset']
+
+    time.sleep(0.01)
+    with open(tmp_path / 'DSE.csv', 'ab') as f:
+        f.write(row[20:])
+    after = site_data.load_dataset('dse')
+    assert len(after) == len(before) + 1
+    assert str(after['Site Id'].iloc[-1]) == 'ES2-SUI-99999'
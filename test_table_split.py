@@ -0,0 +1,36 @@
+import pandas as pd
+
+import site_data
+from table_split import column_blocks, split_tables
+
+RAW = (
+    b',,,,,,\r\n'
+    b'Date,Spare Name,Used Count,,Spare Name,Spare Received,Available Balance\r\n'
+    b'20-Oct-25, DC CTs ,2,,SPD,8,8\r\n'
+    b',,,,,,\r\n'
+    b'30-Oct-25,SPD,1,,DC CTs,15,11\r\n'
+    b',,,,Total,23,19\r\n'
+)
+
+
+def test_column_blocks():
+    grid = pd.DataFrame([['a', None, None, 'b', 'c'], [None, None, None, 'd', None]])
+    assert column_blocks(grid) == [(0, 1), (3, 5)]
+
+
+def test_side_by_side_tables():
+    usage, balance = split_tables(RAW)
+    assert list(usage.columns) == ['Date', 'Spare Name', 'Used Count']
+    assert usage['Spare Name'].tolist() == ['DC CTs', 'SPD']
+    assert usage['Used Count'].tolist() == [2, 1]
+    # The Total footer is left out and the numbers are typed
+    assert balance['Spare Name'].tolist() == ['SPD', 'DC CTs']
+    assert balance['Available Balance'].tolist() == [8, 11]
+    assert usage.attrs == balance.attrs == {'encoding': 'utf-8', 'repaired_bytes': 0}
+
+
+def test_real_export_splits():
+    usage = site_data.load_dataset('spare_usage')
+    balance = site_data.load_dataset('spare_balance')
+    assert 'Used Count' in usage.columns
+    assert 'Available Balance' in balance.columns